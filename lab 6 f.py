@@ -1,15 +1,282 @@
 import pandas as pd
+import numpy as np
+import os
 import random
 import re
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+RATING_HIERARCHY = {'G': 1, 'PG': 2, 'PG-13': 3, 'R': 4}
+
+
+def _score_profile_block(catalog_arrays, profile_arrays, k, chunk_size):
+    """Score a block of encoded profiles against the catalog, chunk by chunk.
+
+    Mirrors calculate_match_score term by term. Returns the catalog indices of
+    the top-k movies per profile (-1 where fewer than k movies scored above 0).
+    """
+    genre_matrix, rating_levels, quality_bonus, excluded, genre_weights = catalog_arrays
+    (profile_genres, rating_limits, people_idx, actor_hits, director_hits,
+     keyword_incidence, keyword_hits, active) = profile_arrays
+
+    n_movies = genre_matrix.shape[0]
+    n_profiles = profile_genres.shape[0]
+    weighted_genres = profile_genres * genre_weights
+
+    # Composite key: rounded score in cents, ties broken by catalog order
+    # (generate_suggestions sorts stably on match_score).
+    best_keys = np.full((n_profiles, k), -1, dtype=np.int64)
+    best_idx = np.full((n_profiles, k), -1, dtype=np.int64)
+
+    for start in range(0, n_movies, chunk_size):
+        stop = min(start + chunk_size, n_movies)
+        genres_chunk = genre_matrix[start:stop].T
+
+        # Genres: len(matched) * 2.2 * (1 + sum of matched importance)
+        matched = profile_genres @ genres_chunk
+        importance = weighted_genres @ genres_chunk
+        score = matched * 2.2 * (1.0 + importance)
+
+        # Rating limit
+        levels = rating_levels[start:stop]
+        rating_ok = (levels > 0) & (levels <= rating_limits[:, None])
+        score += np.where(rating_ok, 1.8, 0.0)
+
+        # Favorite people: the first listed person that matches wins
+        people_score = np.zeros_like(score)
+        for j in range(people_idx.shape[1]):
+            person = people_idx[:, j]
+            has_person = (person >= 0)[:, None]
+            actor = actor_hits[person, start:stop] & has_person
+            director = director_hits[person, start:stop] & has_person
+            value = np.where(actor, 1.7, np.where(director, 2.2, 0.0))
+            people_score = np.where(people_score > 0, people_score, value)
+        score += people_score
+
+        # Keywords: any keyword found in the searchable content
+        keyword_found = (keyword_incidence @ keyword_hits[:, start:stop]) > 0
+        score += np.where(keyword_found, 1.2, 0.0)
+
+        score += quality_bonus[start:stop]
+
+        score = np.minimum(score / 9.5 * 10, 10.0)
+        cents = np.rint(score * 100).astype(np.int64)
+        cents[:, excluded[start:stop]] = 0
+        cents[~active] = 0
+
+        order = n_movies - np.arange(start, stop, dtype=np.int64)
+        keys = np.where(cents > 0, cents * (n_movies + 1) + order, -1)
+
+        all_keys = np.concatenate([best_keys, keys], axis=1)
+        all_idx = np.concatenate(
+            [best_idx, np.broadcast_to(np.arange(start, stop), keys.shape)], axis=1)
+        if all_keys.shape[1] > k:
+            top = np.argpartition(-all_keys, k - 1, axis=1)[:, :k]
+            best_keys = np.take_along_axis(all_keys, top, axis=1)
+            best_idx = np.take_along_axis(all_idx, top, axis=1)
+        else:
+            best_keys, best_idx = all_keys, all_idx
+
+    order = np.argsort(-best_keys, axis=1, kind='stable')
+    best_keys = np.take_along_axis(best_keys, order, axis=1)
+    best_idx = np.take_along_axis(best_idx, order, axis=1)
+    best_idx[best_keys < 0] = -1
+    return best_idx
+
+
+_worker_catalog = None
+
+
+def _current_rss():
+    """Resident set size in bytes (Linux only; 0 elsewhere)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _init_batch_worker(catalog_arrays):
+    global _worker_catalog
+    _worker_catalog = catalog_arrays
+
+
+def _score_profile_block_in_worker(profile_arrays, k, chunk_size):
+    return _score_profile_block(_worker_catalog, profile_arrays, k, chunk_size)
+
+
+class Vocabulary:
+    """Interned strings shared by every movie; each string is stored once."""
+    
+    def __init__(self):
+        self.strings = []
+        self.codes = {}
+    
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.codes[value] = code
+            self.strings.append(value)
+        return code
+    
+    def __getitem__(self, code):
+        return self.strings[code]
+    
+    def __len__(self):
+        return len(self.strings)
+
+
+class MovieView(Mapping):
+    """Read-only dict-style view of one movie in a MovieCatalog."""
+    __slots__ = ('_catalog', '_index')
+    
+    def __init__(self, catalog, index):
+        self._catalog = catalog
+        self._index = index
+    
+    def __getitem__(self, key):
+        return self._catalog.field(self._index, key)
+    
+    def __iter__(self):
+        return iter(MovieCatalog.FIELDS)
+    
+    def __len__(self):
+        return len(MovieCatalog.FIELDS)
+    
+    def __repr__(self):
+        return f"MovieView({dict(self)!r})"
+
+
+class MovieCatalog(Sequence):
+    """Struct-of-arrays movie catalog.
+    
+    Repeated strings (genres, people, keywords, ratings, descriptions) are
+    stored as integer codes into shared vocabularies, and the per-movie
+    lists use CSR-style offset/value arrays. Indexing returns a MovieView,
+    so code written against the old list of dicts keeps working.
+    """
+    FIELDS = ('movie_id', 'title', 'year', 'genres', 'rating', 'quality_score',
+              'actors', 'director', 'keywords', 'description')
+    LIST_FIELDS = ('genres', 'actors', 'keywords')
+    COLUMNS = {
+        'movie_id': ('movie_ids', np.int64),
+        'year': ('years', np.int16),
+        'quality_score': ('quality_scores', np.float64),
+        'rating': ('rating_codes', np.int8),
+        'director': ('director_codes', np.int32),
+        'description': ('description_codes', np.int32),
+    }
+    NO_YEAR = -1
+    
+    def __init__(self):
+        self.genre_vocab = Vocabulary()
+        self.people_vocab = Vocabulary()
+        self.keyword_vocab = Vocabulary()
+        self.rating_vocab = Vocabulary()
+        self.description_vocab = Vocabulary()
+        self.rating_vocab.code(None)
+        
+        self.movie_ids = array('q')
+        self.titles = []
+        self.years = array('h')
+        self.quality_scores = array('d')
+        self.rating_codes = array('b')
+        self.director_codes = array('i')
+        self.description_codes = array('i')
+        self.offsets = {name: array('i', [0]) for name in self.LIST_FIELDS}
+        self.values = {name: array('i') for name in self.LIST_FIELDS}
+        self.version = 0  # bumped on every change, so derived caches can tell they are stale
+    
+    @classmethod
+    def from_records(cls, records):
+        catalog = cls()
+        for record in records:
+            catalog.append(record)
+        return catalog
+    
+    def _list_vocab(self, name):
+        return {'genres': self.genre_vocab, 'actors': self.people_vocab,
+                'keywords': self.keyword_vocab}[name]
+    
+    def append(self, record):
+        """Encode a movie dict and add it to the catalog."""
+        year = record['year']
+        self.movie_ids.append(record['movie_id'])
+        self.titles.append(record['title'])
+        self.years.append(self.NO_YEAR if year is None else year)
+        self.quality_scores.append(record['quality_score'])
+        self.rating_codes.append(self.rating_vocab.code(record['rating']))
+        self.director_codes.append(self.people_vocab.code(record['director']))
+        self.description_codes.append(self.description_vocab.code(record['description']))
+        for name in self.LIST_FIELDS:
+            vocab = self._list_vocab(name)
+            self.values[name].extend(vocab.code(v) for v in record[name])
+            self.offsets[name].append(len(self.values[name]))
+        self.version += 1
+    
+    def codes(self, index, name):
+        """Vocabulary codes of a list field for one movie."""
+        offsets = self.offsets[name]
+        return self.values[name][offsets[index]:offsets[index + 1]]
+    
+    def field(self, index, key):
+        if key in self.offsets:
+            vocab = self._list_vocab(key)
+            return [vocab[c] for c in self.codes(index, key)]
+        if key == 'movie_id':
+            return self.movie_ids[index]
+        if key == 'title':
+            return self.titles[index]
+        if key == 'year':
+            year = self.years[index]
+            return None if year == self.NO_YEAR else year
+        if key == 'rating':
+            return self.rating_vocab[self.rating_codes[index]]
+        if key == 'quality_score':
+            return self.quality_scores[index]
+        if key == 'director':
+            return self.people_vocab[self.director_codes[index]]
+        if key == 'description':
+            return self.description_vocab[self.description_codes[index]]
+        raise KeyError(key)
+    
+    def column(self, name):
+        """Fixed-width column as a NumPy array."""
+        attr, dtype = self.COLUMNS[name]
+        return np.array(getattr(self, attr), dtype=dtype)
+    
+    def csr(self, name):
+        """(offsets, values) NumPy arrays of a list field."""
+        return (np.array(self.offsets[name], dtype=np.int32),
+                np.array(self.values[name], dtype=np.int32))
+    
+    def __len__(self):
+        return len(self.movie_ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MovieView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('movie index out of range')
+        return MovieView(self, index)
+
 
 class MovieSuggestionSystem:
     def __init__(self):
-        self.movie_collection = []
+        self.movie_collection = MovieCatalog()
         self.user_preferences = {}
         self.feedback_log = []
         self.genre_importance = {}
         self.liked_movies = set()
         self.disliked_movies = set()
+        self._batch_encoding = None
         
         self.initialize_movie_database()
         print(f"\nSystem ready with {len(self.movie_collection):,} movies")
@@ -25,111 +292,7 @@ class MovieSuggestionSystem:
             
             for idx, movie_entry in movie_data.iterrows():
                 try:
-                    movie_id = int(movie_entry['movieId'])
-                    title = str(movie_entry['title']).strip()
-                    
-                    # Extract genres
-                    genres = []
-                    if pd.notna(movie_entry['genres']) and str(movie_entry['genres']) != '(no genres listed)':
-                        genres = str(movie_entry['genres']).split('|')
-                    
-                    # Extract title and year
-                    clean_title = title
-                    year = None
-                    
-                    year_pattern = r'\((\d{4})\)'
-                    year_match = re.search(year_pattern, title)
-                    if year_match:
-                        year = int(year_match.group(1))
-                        clean_title = re.sub(r'\s*\(\d{4}\)', '', title).strip()
-                    
-                    # Determine cast based on genres
-                    actors = []
-                    genre_actors = {
-                        'Action': ['Dwayne Johnson', 'Keanu Reeves', 'Charlize Theron'],
-                        'Comedy': ['Kevin Hart', 'Tina Fey', 'Will Ferrell'],
-                        'Drama': ['Anthony Hopkins', 'Frances McDormand', 'Daniel Day-Lewis'],
-                        'Horror': ['Vera Farmiga', 'Patrick Wilson', 'Tony Todd'],
-                        'Romance': ['Timothee Chalamet', 'Zendaya', 'Henry Golding'],
-                        'Sci-Fi': ['Chris Pine', 'Zoe Saldana', 'Michael B. Jordan'],
-                        'Animation': ['Jack Black', 'Anya Taylor-Joy', 'Chris Pratt']
-                    }
-                    
-                    for genre in genres:
-                        if genre in genre_actors:
-                            actors.extend(genre_actors[genre])
-                    
-                    actors = list(dict.fromkeys(actors))[:4]
-                    
-                    # Assign director
-                    director_assignment = {
-                        'Action': 'Michael Bay',
-                        'Comedy': 'Paul Feig',
-                        'Drama': 'David Fincher',
-                        'Horror': 'James Wan',
-                        'Romance': 'Jon M. Chu',
-                        'Sci-Fi': 'Denis Villeneuve',
-                        'Animation': 'Pete Docter'
-                    }
-                    
-                    selected_director = 'Guillermo del Toro'
-                    for genre in genres:
-                        if genre in director_assignment:
-                            selected_director = director_assignment[genre]
-                            break
-                    
-                    # Determine rating
-                    rating_levels = {
-                        'Horror': 'R',
-                        'Crime': 'R', 
-                        'Children': 'PG',
-                        'Animation': 'PG'
-                    }
-                    
-                    rating = 'PG-13'
-                    for genre in genres:
-                        if genre in rating_levels:
-                            rating = rating_levels[genre]
-                            break
-                    
-                    if rating == 'PG-13':
-                        rating = random.choice(['PG-13', 'PG', 'R'])
-                    
-                    # Create movie description
-                    if genres:
-                        primary_genre = genres[0].lower()
-                        themes = ['relationships', 'conflict', 'journey', 'identity', 'survival', 'transformation']
-                        description = f"A cinematic exploration of {random.choice(themes)} through {primary_genre} storytelling."
-                    else:
-                        description = "A compelling cinematic experience."
-                    
-                    # Define keywords
-                    keywords = [genre.lower() for genre in genres[:3]]
-                    if 'Action' in genres:
-                        keywords.extend(['thrilling', 'spectacle', 'explosive'])
-                    if 'Comedy' in genres:
-                        keywords.extend(['hilarious', 'entertaining', 'lighthearted'])
-                    if 'Drama' in genres:
-                        keywords.extend(['profound', 'meaningful', 'intense'])
-                    
-                    keywords = list(dict.fromkeys(keywords))[:6]
-                    
-                    # Quality rating
-                    quality_score = round(random.uniform(2.8, 4.9), 1)
-                    
-                    self.movie_collection.append({
-                        'movie_id': movie_id,
-                        'title': clean_title,
-                        'year': year,
-                        'genres': genres,
-                        'rating': rating,
-                        'quality_score': quality_score,
-                        'actors': actors,
-                        'director': selected_director,
-                        'keywords': keywords,
-                        'description': description
-                    })
-                    
+                    self.movie_collection.append(self._build_movie_record(movie_entry))
                 except Exception:
                     continue
             
@@ -139,6 +302,113 @@ class MovieSuggestionSystem:
             print(f"Data loading issue: {e}")
             self.load_example_movies()
     
+    def _build_movie_record(self, movie_entry):
+        """Build one catalog record from a movies.csv row."""
+        movie_id = int(movie_entry['movieId'])
+        title = str(movie_entry['title']).strip()
+        
+        # Extract genres
+        genres = []
+        if pd.notna(movie_entry['genres']) and str(movie_entry['genres']) != '(no genres listed)':
+            genres = str(movie_entry['genres']).split('|')
+        
+        # Extract title and year
+        clean_title = title
+        year = None
+        
+        year_pattern = r'\((\d{4})\)'
+        year_match = re.search(year_pattern, title)
+        if year_match:
+            year = int(year_match.group(1))
+            clean_title = re.sub(r'\s*\(\d{4}\)', '', title).strip()
+        
+        # Determine cast based on genres
+        actors = []
+        genre_actors = {
+            'Action': ['Dwayne Johnson', 'Keanu Reeves', 'Charlize Theron'],
+            'Comedy': ['Kevin Hart', 'Tina Fey', 'Will Ferrell'],
+            'Drama': ['Anthony Hopkins', 'Frances McDormand', 'Daniel Day-Lewis'],
+            'Horror': ['Vera Farmiga', 'Patrick Wilson', 'Tony Todd'],
+            'Romance': ['Timothee Chalamet', 'Zendaya', 'Henry Golding'],
+            'Sci-Fi': ['Chris Pine', 'Zoe Saldana', 'Michael B. Jordan'],
+            'Animation': ['Jack Black', 'Anya Taylor-Joy', 'Chris Pratt']
+        }
+        
+        for genre in genres:
+            if genre in genre_actors:
+                actors.extend(genre_actors[genre])
+        
+        actors = list(dict.fromkeys(actors))[:4]
+        
+        # Assign director
+        director_assignment = {
+            'Action': 'Michael Bay',
+            'Comedy': 'Paul Feig',
+            'Drama': 'David Fincher',
+            'Horror': 'James Wan',
+            'Romance': 'Jon M. Chu',
+            'Sci-Fi': 'Denis Villeneuve',
+            'Animation': 'Pete Docter'
+        }
+        
+        selected_director = 'Guillermo del Toro'
+        for genre in genres:
+            if genre in director_assignment:
+                selected_director = director_assignment[genre]
+                break
+        
+        # Determine rating
+        rating_levels = {
+            'Horror': 'R',
+            'Crime': 'R', 
+            'Children': 'PG',
+            'Animation': 'PG'
+        }
+        
+        rating = 'PG-13'
+        for genre in genres:
+            if genre in rating_levels:
+                rating = rating_levels[genre]
+                break
+        
+        if rating == 'PG-13':
+            rating = random.choice(['PG-13', 'PG', 'R'])
+        
+        # Create movie description
+        if genres:
+            primary_genre = genres[0].lower()
+            themes = ['relationships', 'conflict', 'journey', 'identity', 'survival', 'transformation']
+            description = f"A cinematic exploration of {random.choice(themes)} through {primary_genre} storytelling."
+        else:
+            description = "A compelling cinematic experience."
+        
+        # Define keywords
+        keywords = [genre.lower() for genre in genres[:3]]
+        if 'Action' in genres:
+            keywords.extend(['thrilling', 'spectacle', 'explosive'])
+        if 'Comedy' in genres:
+            keywords.extend(['hilarious', 'entertaining', 'lighthearted'])
+        if 'Drama' in genres:
+            keywords.extend(['profound', 'meaningful', 'intense'])
+        
+        keywords = list(dict.fromkeys(keywords))[:6]
+        
+        # Quality rating
+        quality_score = round(random.uniform(2.8, 4.9), 1)
+        
+        return {
+            'movie_id': movie_id,
+            'title': clean_title,
+            'year': year,
+            'genres': genres,
+            'rating': rating,
+            'quality_score': quality_score,
+            'actors': actors,
+            'director': selected_director,
+            'keywords': keywords,
+            'description': description
+        }
+    
     def load_example_movies(self):
         """Load example movies if CSV is unavailable."""
         print("Using example movie database...")
@@ -182,7 +452,7 @@ class MovieSuggestionSystem:
             }
         ]
         
-        self.movie_collection = example_movies
+        self.movie_collection = MovieCatalog.from_records(example_movies)
     
     def collect_user_preferences(self):
         """Collect user movie preferences."""
@@ -216,18 +486,20 @@ class MovieSuggestionSystem:
         
         print("\nPreferences recorded!")
     
-    def calculate_match_score(self, movie_entry):
+    def calculate_match_score(self, movie_entry, preferences=None):
         """Calculate match score between movie and preferences."""
         match_score = 0
         match_reasons = []
         
-        if not self.user_preferences:
+        if preferences is None:
+            preferences = self.user_preferences
+        if not preferences:
             return 0, []
         
         # Genre matching
-        if self.user_preferences.get('genres'):
+        if preferences.get('genres'):
             movie_genres = [g.lower() for g in movie_entry['genres']]
-            user_genres = self.user_preferences['genres']
+            user_genres = preferences['genres']
             matched_genres = set(movie_genres) & set(user_genres)
             
             if matched_genres:
@@ -242,10 +514,10 @@ class MovieSuggestionSystem:
                 match_reasons.append(f"Genres: {', '.join([g.title() for g in matched_genres])}")
         
         # Rating matching
-        if self.user_preferences.get('rating_limit') and movie_entry['rating']:
-            rating_hierarchy = {'G': 1, 'PG': 2, 'PG-13': 3, 'R': 4}
+        if preferences.get('rating_limit') and movie_entry['rating']:
+            rating_hierarchy = RATING_HIERARCHY
             movie_rating = movie_entry['rating']
-            user_limit = self.user_preferences['rating_limit']
+            user_limit = preferences['rating_limit']
             
             if movie_rating in rating_hierarchy and user_limit in rating_hierarchy:
                 if rating_hierarchy[movie_rating] <= rating_hierarchy[user_limit]:
@@ -253,11 +525,11 @@ class MovieSuggestionSystem:
                     match_reasons.append(f"Rating: {movie_rating}")
         
         # Actor/director matching
-        if self.user_preferences.get('favorite_people'):
+        if preferences.get('favorite_people'):
             movie_actors = [a.lower() for a in movie_entry['actors']]
             movie_director = movie_entry['director'].lower()
             
-            for person in self.user_preferences['favorite_people']:
+            for person in preferences['favorite_people']:
                 if person in movie_actors:
                     match_score += 1.7
                     match_reasons.append(f"Actor: {person.title()}")
@@ -268,14 +540,10 @@ class MovieSuggestionSystem:
                     break
         
         # Keyword matching
-        if self.user_preferences.get('keywords'):
-            search_content = ' '.join([
-                movie_entry['title'].lower(),
-                ' '.join(movie_entry['keywords']),
-                movie_entry['description'].lower()
-            ])
+        if preferences.get('keywords'):
+            search_content = self._search_content(movie_entry)
             
-            for keyword in self.user_preferences['keywords']:
+            for keyword in preferences['keywords']:
                 if keyword in search_content:
                     match_score += 1.2
                     match_reasons.append(f"Keyword: '{keyword}'")
@@ -291,6 +559,31 @@ class MovieSuggestionSystem:
         
         return round(normalized_score, 2), match_reasons[:2]
     
+    @staticmethod
+    def _search_content(movie_entry):
+        """Text searched by keyword preferences."""
+        return ' '.join([
+            movie_entry['title'].lower(),
+            ' '.join(movie_entry['keywords']),
+            movie_entry['description'].lower()
+        ])
+    
+    @staticmethod
+    def _suggestion_entry(movie_entry, match_score, reasons):
+        """Build the suggestion record shown to the user."""
+        return {
+            'movie_id': movie_entry['movie_id'],
+            'title': movie_entry['title'],
+            'year': movie_entry['year'],
+            'genres': ', '.join(movie_entry['genres'][:3]),
+            'rating': movie_entry['rating'],
+            'quality_score': movie_entry['quality_score'],
+            'actors': ', '.join(movie_entry['actors']),
+            'director': movie_entry['director'],
+            'match_score': match_score,
+            'match_reasons': reasons
+        }
+    
     def generate_suggestions(self, count=10):
         """Generate movie suggestions based on preferences."""
         if not self.user_preferences:
@@ -307,22 +600,205 @@ class MovieSuggestionSystem:
             match_score, reasons = self.calculate_match_score(movie_entry)
             
             if match_score > 0:
-                suggestions.append({
-                    'movie_id': movie_id,
-                    'title': movie_entry['title'],
-                    'year': movie_entry['year'],
-                    'genres': ', '.join(movie_entry['genres'][:3]),
-                    'rating': movie_entry['rating'],
-                    'quality_score': movie_entry['quality_score'],
-                    'actors': ', '.join(movie_entry['actors']),
-                    'director': movie_entry['director'],
-                    'match_score': match_score,
-                    'match_reasons': reasons
-                })
+                suggestions.append(self._suggestion_entry(movie_entry, match_score, reasons))
         
         suggestions.sort(key=lambda x: x['match_score'], reverse=True)
         return suggestions[:count]
     
+    def _encode_catalog(self):
+        """Encode the catalog as arrays for batch scoring (cached per catalog)."""
+        catalog = self.movie_collection
+        n_movies = len(catalog)
+        cached = self._batch_encoding
+        if cached is not None and cached['catalog'] is catalog and cached['version'] == catalog.version:
+            return cached
+        
+        genre_index = {}
+        genre_columns = np.array([genre_index.setdefault(g.lower(), len(genre_index))
+                                  for g in catalog.genre_vocab.strings], dtype=np.int64)
+        offsets, values = catalog.csr('genres')
+        genre_rows = np.repeat(np.arange(n_movies), np.diff(offsets))
+        genre_matrix = np.zeros((n_movies, max(len(genre_index), 1)), dtype=np.float64)
+        genre_matrix[genre_rows, genre_columns[values]] = 1.0
+        
+        rating_levels = np.array([RATING_HIERARCHY.get(r, 0) for r in catalog.rating_vocab.strings],
+                                 dtype=np.int8)
+        people_lower = [p.lower() for p in catalog.people_vocab.strings]
+        actor_offsets, actor_values = catalog.csr('actors')
+        
+        self._batch_encoding = {
+            'catalog': catalog,
+            'version': catalog.version,
+            'size': n_movies,
+            'genre_index': genre_index,
+            'genre_matrix': genre_matrix,
+            'rating_levels': rating_levels[catalog.column('rating')],
+            'quality_bonus': np.where(catalog.column('quality_score') >= 4.2, 0.6, 0.0),
+            'movie_ids': catalog.column('movie_id'),
+            'people_lower': people_lower,
+            'actor_rows': np.repeat(np.arange(n_movies), np.diff(actor_offsets)),
+            'actor_values': actor_values,
+            'director_lower': np.array(people_lower, dtype=str)[catalog.column('director')]
+                              if people_lower else np.array([], dtype=str),
+            'search_content': np.array([self._search_content(m) for m in catalog], dtype=str),
+        }
+        return self._batch_encoding
+    
+    def _encode_profiles(self, profiles, encoding):
+        """Encode profiles as genre/rating matrices plus people and keyword hit tables."""
+        genre_index = encoding['genre_index']
+        n_movies = encoding['size']
+        n_profiles = len(profiles)
+        
+        profile_genres = np.zeros((n_profiles, encoding['genre_matrix'].shape[1]))
+        rating_limits = np.zeros(n_profiles, dtype=np.int8)
+        active = np.array([bool(p) for p in profiles], dtype=bool)
+        
+        person_index = {}
+        keyword_index = {}
+        people_lists = []
+        keyword_lists = []
+        for i, profile in enumerate(profiles):
+            for genre in profile.get('genres') or []:
+                if genre in genre_index:
+                    profile_genres[i, genre_index[genre]] = 1.0
+            if profile.get('rating_limit'):
+                rating_limits[i] = RATING_HIERARCHY.get(profile['rating_limit'], 0)
+            people_lists.append([person_index.setdefault(p, len(person_index))
+                                 for p in profile.get('favorite_people') or []])
+            keyword_lists.append([keyword_index.setdefault(kw, len(keyword_index))
+                                  for kw in profile.get('keywords') or []])
+        
+        max_people = max((len(p) for p in people_lists), default=0)
+        people_idx = np.full((n_profiles, max_people), -1, dtype=np.int64)
+        for i, people in enumerate(people_lists):
+            people_idx[i, :len(people)] = people
+        
+        # One extra all-False row so padded (-1) slots index harmlessly
+        actor_hits = np.zeros((len(person_index) + 1, n_movies), dtype=bool)
+        director_hits = np.zeros((len(person_index) + 1, n_movies), dtype=bool)
+        for person, j in person_index.items():
+            codes = [c for c, name in enumerate(encoding['people_lower']) if name == person]
+            actor_hits[j, encoding['actor_rows'][np.isin(encoding['actor_values'], codes)]] = True
+            director_hits[j] = np.char.find(encoding['director_lower'], person) >= 0
+        
+        keyword_hits = np.zeros((len(keyword_index), n_movies))
+        for keyword, j in keyword_index.items():
+            keyword_hits[j] = np.char.find(encoding['search_content'], keyword) >= 0
+        keyword_incidence = np.zeros((n_profiles, len(keyword_index)))
+        for i, keywords in enumerate(keyword_lists):
+            keyword_incidence[i, keywords] = 1.0
+        
+        return (profile_genres, rating_limits, people_idx, actor_hits, director_hits,
+                keyword_incidence, keyword_hits, active)
+    
+    def generate_suggestions_batch(self, profiles, k=10, chunk_size=4096, profile_block=256, n_workers=1):
+        """Generate the top-k suggestions for many preference profiles at once.
+        
+        Returns one suggestion list per profile, in the same format and order
+        as generate_suggestions would give with that profile active.
+        """
+        if not profiles:
+            return []
+        
+        encoding = self._encode_catalog()
+        excluded = np.isin(encoding['movie_ids'],
+                           np.fromiter(self.liked_movies | self.disliked_movies, dtype=np.int64))
+        genre_weights = np.zeros(encoding['genre_matrix'].shape[1])
+        for genre, j in encoding['genre_index'].items():
+            if genre in self.genre_importance:
+                genre_weights[j] = min(self.genre_importance[genre], 0.25)
+        catalog_arrays = (encoding['genre_matrix'], encoding['rating_levels'],
+                          encoding['quality_bonus'], excluded, genre_weights)
+        
+        blocks = [self._encode_profiles(profiles[i:i + profile_block], encoding)
+                  for i in range(0, len(profiles), profile_block)]
+        
+        if n_workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_batch_worker,
+                                     initargs=(catalog_arrays,)) as pool:
+                top = list(pool.map(_score_profile_block_in_worker, blocks,
+                                    [k] * len(blocks), [chunk_size] * len(blocks)))
+        else:
+            top = [_score_profile_block(catalog_arrays, block, k, chunk_size) for block in blocks]
+        top = np.concatenate(top, axis=0)
+        
+        results = []
+        for profile, indices in zip(profiles, top):
+            suggestions = []
+            for idx in indices:
+                if idx < 0:
+                    break
+                movie_entry = self.movie_collection[idx]
+                match_score, reasons = self.calculate_match_score(movie_entry, profile)
+                suggestions.append(self._suggestion_entry(movie_entry, match_score, reasons))
+            suggestions.sort(key=lambda x: x['match_score'], reverse=True)
+            results.append(suggestions)
+        return results
+    
+    def report_catalog_memory(self, csv_path='movies.csv'):
+        """Compare memory of the old list-of-dicts catalog against MovieCatalog."""
+        movie_data = pd.read_csv(csv_path)
+        
+        def build(container):
+            for _, movie_entry in movie_data.iterrows():
+                try:
+                    container.append(self._build_movie_record(movie_entry))
+                except Exception:
+                    continue
+            return container
+        
+        sizes = {}
+        for name, factory in (('list of dicts', list), ('MovieCatalog', MovieCatalog)):
+            tracemalloc.start()
+            rss_before = _current_rss()
+            container = build(factory())
+            sizes[name] = (tracemalloc.get_traced_memory()[0], _current_rss() - rss_before)
+            tracemalloc.stop()
+            del container
+        
+        print(f"\nCatalog memory for {len(movie_data):,} movies:")
+        for name, (traced, rss) in sizes.items():
+            print(f"  {name:14s} {traced / 2**20:8.1f} MiB traced, {rss / 2**20:8.1f} MiB RSS growth "
+                  f"({traced / max(len(movie_data), 1):,.0f} bytes/movie)")
+        dict_size, compact_size = sizes['list of dicts'][0], sizes['MovieCatalog'][0]
+        print(f"  Reduction: {(1 - compact_size / dict_size) * 100:.1f}%")
+        return sizes
+    
+    def benchmark_batch_suggestions(self, n_profiles=2000, k=10, n_workers=1):
+        """Compare profiles per second of the batch API against the serial scan."""
+        genre_options = ['action', 'comedy', 'drama', 'sci-fi', 'romance', 'horror',
+                         'animation', 'thriller', 'adventure', 'crime']
+        people_options = ['dwayne johnson', 'keanu reeves', 'kevin hart', 'zendaya',
+                          'anthony hopkins', 'michael bay', 'james wan', 'pete docter']
+        keyword_options = ['thrilling', 'hilarious', 'profound', 'love', 'survival', 'journey']
+        rng = random.Random(0)
+        profiles = [{
+            'genres': rng.sample(genre_options, rng.randint(1, 3)),
+            'rating_limit': rng.choice(['G', 'PG', 'PG-13', 'R', None]),
+            'favorite_people': rng.sample(people_options, rng.randint(0, 2)),
+            'keywords': rng.sample(keyword_options, rng.randint(0, 2))
+        } for _ in range(n_profiles)]
+        
+        original_preferences = self.user_preferences
+        serial_profiles = profiles[:min(20, n_profiles)]
+        start = time.perf_counter()
+        for profile in serial_profiles:
+            self.user_preferences = profile
+            self.generate_suggestions(k)
+        serial_rate = len(serial_profiles) / (time.perf_counter() - start)
+        self.user_preferences = original_preferences
+        
+        self._encode_catalog()
+        start = time.perf_counter()
+        self.generate_suggestions_batch(profiles, k, n_workers=n_workers)
+        batch_rate = n_profiles / (time.perf_counter() - start)
+        
+        print(f"\nCatalog: {len(self.movie_collection):,} movies, {n_profiles:,} profiles, k={k}")
+        print(f"Serial generate_suggestions: {serial_rate:,.1f} profiles/sec")
+        print(f"Batch ({n_workers} worker(s)):     {batch_rate:,.1f} profiles/sec")
+        return serial_rate, batch_rate
+    
     def display_suggestions(self):
         """Display generated suggestions."""
         suggestions = self.generate_suggestions()
@@ -450,16 +926,13 @@ class MovieSuggestionSystem:
         print("DEMONSTRATION MODE")
         print("-" * 45)
         
-        original_preferences = self.user_preferences.copy()
+        all_suggestions = self.generate_suggestions_batch(sample_profiles, 5)
         
-        for profile in sample_profiles:
+        for profile, suggestions in zip(sample_profiles, all_suggestions):
             print(f"\n{profile['profile_name']}:")
             print(f"  Preferred genres: {', '.join(profile['genres'])}")
             print(f"  Rating limit: {profile['rating_limit']}")
             
-            self.user_preferences = profile.copy()
-            suggestions = self.generate_suggestions(5)
-            
             if suggestions:
                 print("  Suggested movies:")
                 for i, suggestion in enumerate(suggestions[:3], 1):
@@ -467,7 +940,6 @@ class MovieSuggestionSystem:
             else:
                 print("  No suggestions available")
         
-        self.user_preferences = original_preferences
         print("\nDemonstration complete.")
     
     def show_current_preferences(self):
@@ -554,4 +1026,10 @@ class MovieSuggestionSystem:
 
 if __name__ == "__main__":
     movie_system = MovieSuggestionSystem()
-    movie_system.run()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        movie_system.benchmark_batch_suggestions(n_workers=workers)
+    elif len(sys.argv) > 1 and sys.argv[1] == '--memory':
+        movie_system.report_catalog_memory()
+    else:
+        movie_system.run()
\ No newline at end of file
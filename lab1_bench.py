@@ -0,0 +1,194 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import sklearn
+from sklearn import metrics
+from sklearn.cluster import KMeans
+from sklearn.datasets import load_digits, make_blobs
+from sklearn.decomposition import PCA
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+BASE = Path(__file__).parent
+RESULTS_PATH = BASE / "lab1_bench_results.json"
+BASELINE_PATH = BASE / "lab1_bench_baseline.json"
+VARIANTS = ("k-means++", "random", "PCA-based")
+
+# The scores bench_k_means in the Lab1 script prints, in the same order
+CLUSTERING_METRICS = {
+    "homo": metrics.homogeneity_score,
+    "compl": metrics.completeness_score,
+    "v-meas": metrics.v_measure_score,
+    "ARI": metrics.adjusted_rand_score,
+    "AMI": metrics.adjusted_mutual_info_score,
+}
+
+
+def clustering_scores(data, labels, predicted, silhouette_sample=300, seed=0):
+    """{name: score} for bench_k_means's metrics plus a sampled silhouette.
+
+    Only the sampled rows of data are read, so it can be a memory-mapped
+    array larger than RAM.
+    """
+    scores = {name: m(labels, predicted) for name, m in CLUSTERING_METRICS.items()}
+    rows = np.sort(np.random.default_rng(seed).choice(len(data), min(silhouette_sample, len(data)), replace=False))
+    scores["silhouette"] = metrics.silhouette_score(np.asarray(data[rows]), predicted[rows], metric="euclidean")
+    return scores
+
+
+def kmeans_variant(variant, data, n_clusters, seed=0):
+    """The Lab1 KMeans configurations; PCA-based fits its PCA on data first."""
+    if variant == "PCA-based":
+        pca = PCA(n_components=n_clusters).fit(data)
+        return KMeans(init=pca.components_, n_clusters=n_clusters, n_init=1)
+    return KMeans(init=variant, n_clusters=n_clusters, n_init=4, random_state=seed)
+
+
+def fit_variant(variant, data, n_clusters, seed=0):
+    """Build the variant (including the PCA fit for PCA-based) and fit it after StandardScaler."""
+    return make_pipeline(StandardScaler(), kmeans_variant(variant, data, n_clusters, seed)).fit(data)
+
+
+def bench_variant(variant, data, labels, n_clusters, repeats=5, warmup=1, seed=0):
+    """Time repeated fits of one variant, after warm-up fits.
+
+    The first warm-up fit runs under tracemalloc for the peak memory of
+    one fit (numpy allocations, which covers the data copies and
+    distance buffers); the timed fits run without it.
+    """
+    tracemalloc.start()
+    estimator = fit_variant(variant, data, n_clusters, seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for _ in range(warmup - 1):
+        fit_variant(variant, data, n_clusters, seed)
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        estimator = fit_variant(variant, data, n_clusters, seed)
+        times.append(time.perf_counter() - start)
+    kmeans = estimator[-1]
+    return {
+        "variant": variant,
+        "n_samples": len(data),
+        "n_features": data.shape[1],
+        "n_clusters": n_clusters,
+        "time_median": float(np.median(times)),
+        "time_min": float(np.min(times)),
+        "time_std": float(np.std(times)),
+        "peak_mib": peak / 2**20,
+        "inertia": float(kmeans.inertia_),
+        **{name: float(s) for name, s in clustering_scores(data, labels, kmeans.labels_, seed=seed).items()},
+    }
+
+
+def dataset(n_samples=None, n_features=None, n_clusters=None, seed=0):
+    """The digits data when no size is given, else Gaussian blobs of that shape."""
+    if n_samples is None:
+        return load_digits(return_X_y=True)
+    return make_blobs(n_samples=n_samples, n_features=n_features, centers=n_clusters,
+                      cluster_std=4.0, random_state=seed)
+
+
+def run_suite(sample_sizes=(2000, 10000, 50000), feature_counts=(16, 64), cluster_counts=(10, 30),
+              repeats=5, warmup=1, variants=VARIANTS, seed=0):
+    """Every variant on digits, then on blobs for each (n_samples, n_features, n_clusters)."""
+    data, labels = dataset()
+    configs = [(data, labels, np.unique(labels).size, "digits")]
+    for n_samples in sample_sizes:
+        for n_features in feature_counts:
+            for n_clusters in cluster_counts:
+                configs.append((*dataset(n_samples, n_features, n_clusters, seed), n_clusters, "blobs"))
+
+    records = []
+    print(f"{'data':7s} {'variant':10s} {'n':>7s} {'d':>4s} {'k':>4s} {'median':>8s} {'min':>8s} {'std':>7s} "
+          f"{'MiB':>7s} {'inertia':>12s} " + " ".join(f"{name:>6s}" for name in CLUSTERING_METRICS) + "  silh")
+    for data, labels, n_clusters, name in configs:
+        for variant in variants:
+            if variant == "PCA-based" and n_clusters > min(data.shape):
+                continue
+            record = {"data": name, **bench_variant(variant, data, labels, n_clusters, repeats, warmup, seed)}
+            records.append(record)
+            print(f"{name:7s} {variant:10s} {record['n_samples']:7d} {record['n_features']:4d} {n_clusters:4d} "
+                  f"{record['time_median']:7.3f}s {record['time_min']:7.3f}s {record['time_std']:7.3f} "
+                  f"{record['peak_mib']:7.1f} {record['inertia']:12.0f} "
+                  + " ".join(f"{record[m]:6.3f}" for m in CLUSTERING_METRICS) + f" {record['silhouette']:6.3f}")
+    return records
+
+
+def save_results(records, path=RESULTS_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.platform(),
+            "records": records,
+        }, f, indent=1)
+
+
+def _key(record):
+    return record["data"], record["variant"], record["n_samples"], record["n_features"], record["n_clusters"]
+
+
+def compare(records, baseline_path=BASELINE_PATH, time_tolerance=0.5, memory_tolerance=0.25,
+            score_drop=0.02, min_seconds=0.02):
+    """Regressions against a saved baseline, as (config, message) pairs.
+
+    Flags a best-of-repeats time more than time_tolerance slower (and by
+    at least min_seconds), a peak memory more than memory_tolerance
+    higher, and a v-measure or ARI more than score_drop lower. The time
+    defaults are loose: back-to-back runs of the same code on a shared
+    machine differ by 20-40% on fits under 0.1s.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_key(r): r for r in json.load(f)["records"]}
+    regressions = []
+    for record in records:
+        old = baseline.get(_key(record))
+        if old is None:
+            continue
+        config = "/".join(map(str, _key(record)))
+        slower = record["time_min"] - old["time_min"]
+        if slower > min_seconds and record["time_min"] > old["time_min"] * (1 + time_tolerance):
+            regressions.append((config, f"best time {old['time_min']:.3f}s -> {record['time_min']:.3f}s"))
+        if record["peak_mib"] > old["peak_mib"] * (1 + memory_tolerance):
+            regressions.append((config, f"peak memory {old['peak_mib']:.1f} -> {record['peak_mib']:.1f} MiB"))
+        for score in ("v-meas", "ARI"):
+            if record[score] < old[score] - score_drop:
+                regressions.append((config, f"{score} {old[score]:.3f} -> {record[score]:.3f}"))
+    return regressions
+
+
+def main(mode="run"):
+    """run: sweep, write RESULTS_PATH and compare with BASELINE_PATH if there is one;
+    baseline: sweep and write BASELINE_PATH; quick: a small sweep, for a smoke test."""
+    if mode == "quick":
+        records = run_suite(sample_sizes=(2000,), feature_counts=(16,), cluster_counts=(10,), repeats=2)
+    else:
+        records = run_suite()
+    if mode == "baseline":
+        save_results(records, BASELINE_PATH)
+        print(f"Saved baseline to {BASELINE_PATH}")
+        return 0
+    save_results(records, RESULTS_PATH)
+    print(f"Saved results to {RESULTS_PATH}")
+    if not BASELINE_PATH.exists():
+        print("No baseline yet; run 'python lab1_bench.py baseline' to record one")
+        return 0
+    regressions = compare(records)
+    for config, message in regressions:
+        print(f"REGRESSION {config}: {message}")
+    print(f"{len(regressions)} regression(s) against {BASELINE_PATH}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -0,0 +1,251 @@
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from lab1_bench import clustering_scores
+
+# Same columns as bench_k_means in the Lab1 script
+ROW_FORMAT = "{:9s}\t{:.3f}s\t{:.0f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}"
+
+
+class StreamingKMeans:
+    """StandardScaler -> IncrementalPCA (optional) -> MiniBatchKMeans, fitted chunk by chunk.
+
+    data can be anything sliceable by rows, e.g. np.load(path,
+    mmap_mode="r"); only chunk_size rows are in memory at a time. fit()
+    makes one pass for the scaler, one for the PCA and epochs passes for
+    KMeans, visiting chunks in a shuffled order and each chunk's rows
+    shuffled, in minibatches of batch_size. The starting centers are the
+    best of n_init k-means++ runs of full KMeans on init_size rows of
+    one random full-size chunk.
+    """
+
+    def __init__(self, n_clusters, n_components=None, chunk_size=100_000, batch_size=4096, epochs=1, n_init=4,
+                 init_size=20_000, seed=0):
+        self.n_clusters = n_clusters
+        self.n_init = n_init
+        self.init_size = init_size
+        self.n_components = n_components
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.seed = seed
+
+    def _chunks(self, data, order=None):
+        starts = range(0, len(data), self.chunk_size)
+        for start in (starts if order is None else [starts[i] for i in order]):
+            yield np.asarray(data[start:start + self.chunk_size], dtype=np.float64)
+
+    def _transform(self, chunk):
+        chunk = self.scaler_.transform(chunk)
+        return chunk if self.pca_ is None else self.pca_.transform(chunk)
+
+    def _minibatches(self, data, order, rng):
+        """Transformed, shuffled rows of the chunks in order, batch_size at a time.
+
+        Rows left at the end of a chunk carry over into the next one, and a
+        last minibatch shorter than n_clusters is merged into the one
+        before it: MiniBatchKMeans.partial_fit refuses fewer rows than
+        clusters.
+        """
+        batch = rest = None
+        for chunk in self._chunks(data, order):
+            chunk = self._transform(chunk)[rng.permutation(len(chunk))]
+            if rest is not None:
+                chunk = np.concatenate([rest, chunk])
+            n_full = len(chunk) - len(chunk) % self.batch_size
+            for start in range(0, n_full, self.batch_size):
+                if batch is not None:
+                    yield batch
+                batch = chunk[start:start + self.batch_size]
+            rest = chunk[n_full:]
+        if batch is not None and 0 < len(rest) < self.n_clusters:
+            batch, rest = np.concatenate([batch, rest]), rest[:0]
+        if batch is not None:
+            yield batch
+        if rest is not None and len(rest):
+            yield rest
+
+    def fit(self, data):
+        rng = np.random.default_rng(self.seed)
+        self.scaler_ = StandardScaler()
+        for chunk in self._chunks(data):
+            self.scaler_.partial_fit(chunk)
+
+        self.pca_ = None
+        if self.n_components:
+            pca = IncrementalPCA(n_components=self.n_components)
+            for chunk in self._chunks(data):
+                if len(chunk) >= self.n_components:  # a short last chunk is skipped
+                    pca.partial_fit(self.scaler_.transform(chunk))
+            self.pca_ = pca
+
+        # Seed the centers with a full KMeans (n_init runs, as in Lab1) on a
+        # sample of one random chunk, then refine them with minibatches over all chunks.
+        # Only a full chunk is sampled (the last one may be a few rows); data
+        # shorter than one chunk is sampled whole
+        n_chunks = -(-len(data) // self.chunk_size)
+        sample = next(self._chunks(data, [rng.integers(max(len(data) // self.chunk_size, 1))]))
+        sample = sample[rng.permutation(len(sample))[:self.init_size]]
+        seed_centers = KMeans(n_clusters=self.n_clusters, n_init=self.n_init,
+                              random_state=self.seed).fit(self._transform(sample)).cluster_centers_
+        self.kmeans_ = MiniBatchKMeans(n_clusters=self.n_clusters, init=seed_centers, n_init=1,
+                                       batch_size=self.batch_size, random_state=self.seed)
+        for _ in range(self.epochs):
+            for batch in self._minibatches(data, rng.permutation(n_chunks), rng):
+                self.kmeans_.partial_fit(batch)
+        return self
+
+    def predict(self, data):
+        """Cluster of every row, one chunk at a time; sets inertia_ (in the clustered space)."""
+        labels = np.empty(len(data), dtype=np.int32)
+        self.inertia_ = 0.0
+        start = 0
+        for chunk in self._chunks(data):
+            chunk = self._transform(chunk)
+            found = self.kmeans_.predict(chunk)
+            labels[start:start + len(chunk)] = found
+            self.inertia_ += float(((chunk - self.kmeans_.cluster_centers_[found]) ** 2).sum())
+            start += len(chunk)
+        return labels
+
+
+def write_blobs(path, n_samples, n_features=32, n_clusters=10, cluster_std=14.0, chunk_size=1_000_000, seed=0):
+    """Gaussian blobs straight to a float32 .npy (and labels to <name>_labels.npy), chunk by chunk.
+
+    Returns the labels path.
+    """
+    path = Path(path)
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10, 10, size=(n_clusters, n_features))
+    data = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(n_samples, n_features))
+    labels = np.lib.format.open_memmap(path.with_name(path.stem + "_labels.npy"), mode="w+",
+                                       dtype=np.int32, shape=(n_samples,))
+    for start in range(0, n_samples, chunk_size):
+        n = min(chunk_size, n_samples - start)
+        chunk_labels = rng.integers(n_clusters, size=n)
+        labels[start:start + n] = chunk_labels
+        data[start:start + n] = centers[chunk_labels] + rng.normal(scale=cluster_std, size=(n, n_features))
+    data.flush()
+    labels.flush()
+    return labels.filename
+
+
+def bench_streaming(data, labels, n_clusters, name="streaming", **settings):
+    """fit + predict time, inertia and bench_k_means's scores for StreamingKMeans, as a printed row."""
+    t0 = time.perf_counter()
+    model = StreamingKMeans(n_clusters, **settings).fit(data)
+    predicted = model.predict(data)
+    fit_time = time.perf_counter() - t0
+    scores = clustering_scores(data, labels, predicted)
+    print(ROW_FORMAT.format(name, fit_time, model.inertia_, *scores.values()))
+    return fit_time, scores
+
+
+def digits():
+    """The Lab1 digits table, with streaming rows next to full-batch k-means++."""
+    from sklearn.datasets import load_digits
+
+    data, labels = load_digits(return_X_y=True)
+    n_digits = np.unique(labels).size
+    print("init\t\ttime\tinertia\thomo\tcompl\tv-meas\tARI\tAMI\tsilhouette")
+    t0 = time.perf_counter()
+    estimator = make_pipeline(StandardScaler(), KMeans(init="k-means++", n_clusters=n_digits, n_init=4,
+                                                       random_state=0)).fit(data)
+    fit_time = time.perf_counter() - t0
+    scores = clustering_scores(data, labels, estimator[-1].labels_)
+    print(ROW_FORMAT.format("k-means++", fit_time, estimator[-1].inertia_, *scores.values()))
+    bench_streaming(data, labels, n_digits, "stream", chunk_size=300, batch_size=256, epochs=10)
+    bench_streaming(data, labels, n_digits, "stream+PCA", n_components=n_digits, chunk_size=300,
+                    batch_size=256, epochs=10)
+
+
+def benchmark(sizes=(10**5, 10**6, 10**7), n_features=32, n_clusters=10, n_components=10, full_batch_limit=2 * 10**6):
+    """Streaming vs full-batch KMeans on synthetic blobs stored as memory-mapped .npy files.
+
+    Full-batch (StandardScaler + KMeans, n_init=4) loads the data into
+    memory, so it only runs up to full_batch_limit samples. Peak memory is
+    traced Python/numpy allocations; the memory-mapped file is not counted.
+    """
+    print(f"{'method':12s} {'n':>10s} {'seconds':>9s} {'peak MiB':>9s} {'v-meas':>7s} {'ARI':>7s} {'AMI':>7s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_samples in sizes:
+            path = Path(tmp) / f"blobs_{n_samples}.npy"
+            labels_path = write_blobs(path, n_samples, n_features, n_clusters)
+            data = np.load(path, mmap_mode="r")
+            labels = np.load(labels_path)
+
+            runs = [("stream", lambda data: StreamingKMeans(n_clusters).fit(data).predict(data)),
+                    ("stream+PCA", lambda data: StreamingKMeans(n_clusters, n_components).fit(data).predict(data))]
+            if n_samples <= full_batch_limit:
+                runs.insert(0, ("full batch", lambda data: make_pipeline(
+                    StandardScaler(), KMeans(n_clusters=n_clusters, n_init=4, random_state=0)
+                ).fit(np.asarray(data))[-1].labels_))
+            for method, run in runs:
+                tracemalloc.start()
+                start = time.perf_counter()
+                predicted = run(data)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                scores = clustering_scores(data, labels, predicted)
+                print(f"{method:12s} {n_samples:10,d} {elapsed:9.2f} {peak / 2**20:9.1f} "
+                      f"{scores['v-meas']:7.3f} {scores['ARI']:7.3f} {scores['AMI']:7.3f}")
+        # Close the last memory map before the directory is removed (Windows refuses while it is open)
+        data = labels = None
+
+
+def check(n_clusters=10):
+    """Fit and predict on row counts that leave short chunks and minibatches; raises if any fails.
+
+    The repo has no test suite, so this is the regression check for
+    short last chunks and minibatches (e.g. 100_003 rows used to fail in
+    MiniBatchKMeans.partial_fit on a 3-row minibatch).
+    """
+    rng = np.random.default_rng(0)
+    cases = [(100_003, {}), (100_003, {"n_components": 4}), (1_005, {"chunk_size": 100, "batch_size": 64}),
+             (50, {"chunk_size": 100, "batch_size": 32}), (50, {"chunk_size": 100, "batch_size": 45}),
+             (205, {"chunk_size": 100, "batch_size": 100, "n_components": 4})]
+    for n_samples, settings in cases:
+        data = rng.normal(size=(n_samples, 8))
+        model = StreamingKMeans(n_clusters, **settings).fit(data)
+        labels = model.predict(data)
+        assert labels.shape == (n_samples,) and 0 <= labels.min() and labels.max() < n_clusters
+        print(f"ok  {n_samples:7,d} rows  {settings}")
+
+
+def main(mode="digits", *args):
+    """digits: the Lab1 comparison; bench [n_samples ...]: synthetic benchmark;
+    fit data.npy [labels.npy] [n_clusters]: cluster a .npy file out of core;
+    check: fit on awkward row counts (short last chunk and minibatch)."""
+    if mode == "digits":
+        digits()
+    elif mode == "check":
+        check()
+    elif mode == "bench":
+        benchmark(*([tuple(int(float(a)) for a in args)] if args else []))
+    elif mode == "fit":
+        data = np.load(args[0], mmap_mode="r")
+        labels = np.load(args[1]) if len(args) > 1 else None
+        n_clusters = int(args[2]) if len(args) > 2 else 10
+        if labels is None:
+            model = StreamingKMeans(n_clusters).fit(data)
+            predicted = model.predict(data)
+            print(f"inertia {model.inertia_:.0f}; cluster sizes {np.bincount(predicted).tolist()}")
+        else:
+            print("init\t\ttime\tinertia\thomo\tcompl\tv-meas\tARI\tAMI\tsilhouette")
+            bench_streaming(data, labels, n_clusters)
+    else:
+        raise SystemExit(f"unknown mode {mode!r}; expected digits, bench, fit or check")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,166 @@
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.decomposition import PCA
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+from lab1_bench import CLUSTERING_METRICS, clustering_scores, dataset
+
+INITS = ("k-means++", "random", "PCA-based")
+
+
+def grid(inits=INITS, n_inits=(1, 4), ks=(8, 10, 12), pca_dims=(None, 10, 30)):
+    """(init, n_init, k, pca_dim) configurations; PCA-based is deterministic, so it only gets n_init=1."""
+    return [(init, n_init, k, dim) for init, n_init, k, dim in itertools.product(inits, n_inits, ks, pca_dims)
+            if not (init == "PCA-based" and (n_init > 1 or (dim is not None and k > dim)))]
+
+
+class SharedArrays:
+    """Numpy arrays copied once into shared memory, for worker processes to map without copying."""
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+
+_arrays = {}
+_blocks = []
+_limits = None
+
+
+def _init_worker(specs, threads):
+    """Map the shared arrays and cap this worker's BLAS/OpenMP threads."""
+    global _limits
+    for name, (block_name, shape, dtype) in specs.items():
+        # Workers share the parent's resource tracker, which unlinks the
+        # blocks if the parent dies before SharedArrays.close()
+        block = shared_memory.SharedMemory(name=block_name)
+        _blocks.append(block)
+        _arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    _limits = threadpool_limits(limits=threads)
+
+
+def _fit_config(config, seed=0):
+    init, n_init, k, dim = config
+    data = _arrays["scaled"] if dim is None else _arrays[f"pca{dim}"]
+    start = time.perf_counter()
+    if init == "PCA-based":
+        kmeans = KMeans(init=PCA(n_components=k).fit(data).components_, n_clusters=k, n_init=1)
+    else:
+        kmeans = KMeans(init=init, n_clusters=k, n_init=n_init, random_state=seed)
+    kmeans.fit(data)
+    fit_time = time.perf_counter() - start
+    scores = clustering_scores(_arrays["scaled"], _arrays["labels"], kmeans.labels_, seed=seed)
+    return {"init": init, "n_init": n_init, "k": k, "pca_dim": dim, "time": fit_time,
+            "inertia": float(kmeans.inertia_), **scores}
+
+
+def preprocess(data, labels, configs):
+    """Scale once, and project once per PCA dimensionality in configs."""
+    scaled = StandardScaler().fit_transform(data)
+    arrays = {"scaled": scaled, "labels": np.asarray(labels)}
+    for dim in sorted({dim for *_, dim in configs if dim is not None}):
+        arrays[f"pca{dim}"] = PCA(n_components=dim, random_state=0).fit_transform(scaled)
+    return arrays
+
+
+def sweep(data, labels, configs, n_workers=None, threads_per_worker=None):
+    """Fit every configuration over n_workers processes sharing one preprocessed copy of the data.
+
+    Each worker is capped at threads_per_worker BLAS/OpenMP threads
+    (default: the CPUs divided among the workers), so that n_workers
+    processes do not each start a thread per core.
+    """
+    n_cpus = os.cpu_count() or 1
+    n_workers = n_workers or n_cpus
+    threads = threads_per_worker or max(1, n_cpus // n_workers)
+    shared = SharedArrays(preprocess(data, labels, configs))
+    try:
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(shared.specs, threads)) as pool:
+            return list(pool.map(_fit_config, configs))
+    finally:
+        shared.close()
+
+
+def sweep_naive(data, labels, configs, seed=0):
+    """The Lab1 way, for comparison: one process, StandardScaler and PCA refitted for every configuration."""
+    records = []
+    for init, n_init, k, dim in configs:
+        start = time.perf_counter()
+        steps = [StandardScaler()] + ([PCA(n_components=dim, random_state=0)] if dim else [])
+        reduced = make_pipeline(*steps).fit_transform(data)
+        if init == "PCA-based":
+            kmeans = KMeans(init=PCA(n_components=k).fit(reduced).components_, n_clusters=k, n_init=1)
+        else:
+            kmeans = KMeans(init=init, n_clusters=k, n_init=n_init, random_state=seed)
+        kmeans.fit(reduced)
+        fit_time = time.perf_counter() - start
+        scores = clustering_scores(reduced if dim is None else StandardScaler().fit_transform(data), labels,
+                                   kmeans.labels_, seed=seed)
+        records.append({"init": init, "n_init": n_init, "k": k, "pca_dim": dim, "time": fit_time,
+                        "inertia": float(kmeans.inertia_), **scores})
+    return records
+
+
+def print_table(records):
+    print(f"{'init':10s} {'n_init':>6s} {'k':>3s} {'pca':>4s} {'time':>8s} {'inertia':>10s} "
+          + " ".join(f"{name:>6s}" for name in CLUSTERING_METRICS) + "  silh")
+    for r in records:
+        print(f"{r['init']:10s} {r['n_init']:6d} {r['k']:3d} {str(r['pca_dim'] or '-'):>4s} {r['time']:7.3f}s "
+              f"{r['inertia']:10.0f} " + " ".join(f"{r[m]:6.3f}" for m in CLUSTERING_METRICS)
+              + f" {r['silhouette']:6.3f}")
+
+
+def scaling(data, labels, configs, worker_counts=None):
+    """Wall time of the whole grid for each worker count, against the sequential Lab1-style loop."""
+    n_cpus = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, n_cpus} | {n for n in (8, 16) if n <= n_cpus})
+    start = time.perf_counter()
+    sweep_naive(data, labels, configs)
+    naive = time.perf_counter() - start
+    print(f"{len(configs)} configurations on {data.shape[0]:,} x {data.shape[1]} data, {n_cpus} CPU(s)")
+    print(f"{'sequential, refit scaler/PCA':30s} {naive:7.2f}s")
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        sweep(data, labels, configs, n_workers)
+        elapsed = time.perf_counter() - start
+        print(f"{f'shared memory, {n_workers} worker(s)':30s} {elapsed:7.2f}s  {naive / elapsed:5.2f}x")
+
+
+def main(mode="sweep", *args):
+    """sweep [n_workers]: the grid as one table; scaling [workers ...]: wall time per worker count.
+
+    Runs on digits, or with n=<samples> on 32-feature blobs with 10 clusters.
+    """
+    sizes = [int(float(a[2:])) for a in args if a.startswith("n=")]
+    args = [a for a in args if not a.startswith("n=")]
+    data, labels = dataset(sizes[0], 32, 10) if sizes else dataset()
+    configs = grid()
+    if mode == "sweep":
+        print_table(sweep(data, labels, configs, *map(int, args[:1])))
+    elif mode == "scaling":
+        scaling(data, labels, configs, [int(a) for a in args] or None)
+    else:
+        raise SystemExit(f"unknown mode {mode!r}; expected sweep or scaling")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
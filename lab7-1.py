@@ -1,54 +1,38 @@
+import time  
+START = time.perf_counter()  #startup clock
 import tkinter as tk  
-from tkinter import ttk, messagebox, scrolledtext  
-import pandas as pd 
-from pathlib import Path  
-
-try:  #try
-    from sklearn.feature_extraction.text import TfidfVectorizer  #import
-    from sklearn.neighbors import NearestNeighbors  #import
-    SKLEARN_OK = True  #flag
-except Exception:  #except
-    SKLEARN_OK = False  #flag
-
-BASE = Path(__file__).parent 
-MOVIES_CSV = BASE / "movies.csv"
-RATINGS_CSV = BASE / "ratings.csv"  
-
-try:  #try
-    movies = pd.read_csv(MOVIES_CSV) 
-    ratings = pd.read_csv(RATINGS_CSV) 
-except Exception as e:  
-    tk.Tk().withdraw()  
-    messagebox.showerror("File error", str(e)) 
-    raise SystemExit(1)  
-
-avg_ratings = ratings.groupby("movieId")["rating"].mean().to_dict()  
-movies["avg_rating"] = movies["movieId"].apply(lambda x: float(avg_ratings.get(x, 0.0))) 
-movies["genres"] = movies["genres"].fillna("").astype(str)  #clean
-
-all_genres = sorted({g for gs in movies["genres"] for g in gs.split("|") if g and g != "(no genres listed)"})  #genres
-
-if SKLEARN_OK:  
-    try:  #try
-        tfidf = TfidfVectorizer(stop_words="english")  #vectorizer
-        genres_matrix = tfidf.fit_transform(movies["genres"])
-        knn = NearestNeighbors(metric="cosine", algorithm="brute") 
-        knn.fit(genres_matrix)  #train
-        CONTENT_MODE = "sklearn"  #mode
-    except Exception:  #except
-        CONTENT_MODE = "fallback"  #mode
-        genres_matrix = knn = None  
-else:  #else
-    CONTENT_MODE = "fallback"  #mode
-    genres_matrix = knn = None 
-
-liked_movies = []  
-disliked_movies = []
+from tkinter import messagebox, scrolledtext  
+import os  
+import sys  
+from lab7_core import RecommenderCore, MOVIES_CSV, RATINGS_CSV
+from lab7_worker import ComputeExecutor
+from lab7_resultview import ResultList
+from lab7_sessions import SessionStore
+
+NEIGHBOR_BACKEND = os.environ.get("LAB7_NEIGHBORS", "brute")  #brute or lsh
+core = RecommenderCore(MOVIES_CSV, RATINGS_CSV, NEIGHBOR_BACKEND)  #loads after the window is up
+
+store = SessionStore()  #per-user likes/dislikes in lab7_sessions.db
+session = None  #current user's UserSession
 current_user = None  
 
 root = tk.Tk()  #root
 root.title("Movie Recommender - Multi-Search")  
 root.geometry("1300x700")  
+executor = ComputeExecutor(root.after)  #off-UI compute, latest click wins
+
+def run_query(compute, *args, render):  #background
+    root.config(cursor="watch")  
+    def done(result):  
+        root.config(cursor="")  
+        render(result)  
+    def failed(e):  
+        root.config(cursor="")  
+        messagebox.showerror("Error", str(e))  
+    executor.submit(compute, *args, on_result=done, on_error=failed, channel="results")  
+
+def render_rows(rows):  #render
+    render_results(core.movies.iloc[rows])  
 
 def login_screen():  #login
     win = tk.Toplevel(root)  
@@ -61,11 +45,13 @@ def login_screen():  #login
     entry.pack()  
 
     def submit():  #submit
-        global current_user  #global
+        global current_user, session  #global
         if not entry.get().strip():  
             messagebox.showwarning("Empty", "Enter a username") 
             return  
         current_user = entry.get().strip()  #assign
+        session = store.session(current_user)  #saved history
+        result_list.scroll_to(result_list.offset)  #recolour for this user
         user_label.config(text=f"👤 Logged in as: {current_user}") 
         win.destroy()  
 
@@ -134,74 +120,36 @@ tk.Button(search_buttons_frame, text="Clear Search",
 output_frame = tk.Frame(root)  
 output_frame.pack(fill="both", expand=True, padx=10, pady=8)  
 
-canvas = tk.Canvas(output_frame)  
-scrollbar = ttk.Scrollbar(output_frame, orient="vertical", command=canvas.yview)  
-scrollable = tk.Frame(canvas)  
-
-scrollable.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))  #bind
-canvas.create_window((0, 0), window=scrollable, anchor="nw")  
-canvas.configure(yscrollcommand=scrollbar.set)  #config
+def movie_state(mid):  #state
+    return session.state(mid) if session is not None else None  
 
-canvas.pack(side="left", fill="both", expand=True)  
-scrollbar.pack(side="right", fill="y")  
-
-def clear_output():  #clear
-    for w in scrollable.winfo_children(): 
-        w.destroy()  
+result_list = ResultList(output_frame, lambda m: like_movie(m), lambda m: dislike_movie(m), movie_state)  #pooled rows
+result_list.pack(fill="both", expand=True)  
 
 def show_text(text):  #show
-    clear_output()  #old
-    tk.Label(scrollable, text=text, justify="left", anchor="w").pack(fill="x", padx=10, pady=10)  
+    result_list.show_text(text)  
 
 def require_login():  #guard
     if current_user is None:  
         messagebox.showwarning("Login", "Please login first")  #alert
         return False 
+    if not core.ready.is_set():  #readiness
+        show_text("Loading movies and models, please wait...")  
+        return False  
     return True 
 
 def like_movie(mid):  #like
     if not require_login(): return  
-    if mid not in liked_movies:  
-        liked_movies.append(mid) 
-    if mid in disliked_movies:  
-        disliked_movies.remove(mid) 
+    session.like(mid)  
 
 def dislike_movie(mid):  #dislike
     if not require_login(): return
-    if mid not in disliked_movies:  
-        disliked_movies.append(mid)
-    if mid in liked_movies:  
-        liked_movies.remove(mid)
+    session.dislike(mid)  
 
 def render_results(df, search_terms=None): 
-    clear_output()  
-    
-    # Show search terms used (if provided)
-    if search_terms:
-        term_info = tk.Frame(scrollable, pady=5, bg="#f0f0f0")
-        term_info.pack(fill="x", padx=5)
-        terms_text = f"Search terms: {', '.join(search_terms[:5])}"
-        if len(search_terms) > 5:
-            terms_text += f" and {len(search_terms) - 5} more..."
-        tk.Label(term_info, text=terms_text, font=("Segoe UI", 9, "italic"),
-                bg="#f0f0f0").pack(side="left", padx=10)
-    
-    # Show result count
-    count_frame = tk.Frame(scrollable, pady=2)
-    count_frame.pack(fill="x", padx=5)
-    tk.Label(count_frame, text=f"Found {len(df)} movies:", 
-             font=("Segoe UI", 10, "bold")).pack(side="left", padx=5)
-    
-    for _, r in df.iterrows():  
-        mid = int(r.movieId)  #id
-        row = tk.Frame(scrollable, pady=4, padx=5)  
-        row.pack(fill="x")  
-        text = f"{r.title} | {r.genres} |  {r.avg_rating:.1f}"  #text
-        tk.Label(row, text=text, anchor="w", font=("Segoe UI", 10)).pack(side="left", fill="x", expand=True)  
-        tk.Button(row, text="Like 👍", command=lambda m=mid: (like_movie(m), refresh()),
-                 bg="#e8f5e9", font=("Segoe UI", 9)).pack(side="right", padx=2)  
-        tk.Button(row, text="Dislike 👎", command=lambda m=mid: (dislike_movie(m), refresh()),
-                 bg="#ffebee", font=("Segoe UI", 9)).pack(side="right", padx=2)  
+    # Only the visible rows get widgets; Like/Dislike recolour their own row
+    result_list.show_results(df["movieId"].to_numpy(), df["title"].to_numpy(),
+                             df["genres"].to_numpy(), df["avg_rating"].to_numpy(), search_terms)
 
 def search_by_title_and_genre():
     if not require_login():
@@ -220,67 +168,39 @@ def search_by_title_and_genre():
         )
         return
 
-    res = movies.copy()  # copy dataframe
-
-    # Filter by multiple search terms
-    if search_terms:
-        # Create a boolean mask for ANY of the search terms
-        mask = pd.Series(False, index=res.index)
-        for term in search_terms:
-            mask = mask | res.title.str.lower().str.contains(term, na=False)
-        res = res[mask]
-
-    # Filter by selected genres
-    if selected_genres:
-        res = res[res.genres.apply(
-            lambda g: all(x in g.split('|') for x in selected_genres)
-        )]
-
     # Show results
-    if res.empty:
-        messagebox.showwarning(
-            "No Results",
-            f"No movies match your {len(search_terms)} search term(s) and selected genres."
-        )
-        return
-
-    # Sort by relevance (exact matches first, then partial matches)
-    if search_terms:
-        def relevance_score(title):
-            title_lower = title.lower()
-            score = 0
-            for term in search_terms:
-                if term in title_lower:
-                    score += 1
-            return score
-        
-        res['relevance'] = res['title'].apply(relevance_score)
-        res = res.sort_values(['relevance', 'avg_rating'], ascending=[False, False])
-        res = res.drop('relevance', axis=1)
-
-    render_results(res.head(200), search_terms)
-
-def refresh():  #refresh
-    search_by_title_and_genre()  #call
+    def show_search(rows):
+        if len(rows) == 0:
+            messagebox.showwarning(
+                "No Results",
+                f"No movies match your {len(search_terms)} search term(s) and selected genres."
+            )
+            return
+        render_results(core.movies.iloc[rows], search_terms)
+
+    # Index lookups: ANY search term, ALL selected genres, sorted by relevance
+    run_query(core.search, search_terms, selected_genres, render=show_search)
 
 # Genre selection frame
 check_frame = tk.LabelFrame(root, text="Filter by Genres", padx=10, pady=5)
 check_frame.pack(fill="x", padx=10, pady=5)
 
 genre_vars = {}  #dict
-col = row = 0  
-for g in all_genres:  
-    v = tk.BooleanVar()  
-    tk.Checkbutton(check_frame, text=g, variable=v, font=("Segoe UI", 9)).grid(row=row, column=col, sticky="w", padx=2, pady=1)  
-    genre_vars[g] = v 
-    col += 1  
-    if col >= 8:  # Increased to 8 columns for better layout
-        col = 0  
-        row += 1
-
-# Add select all/none buttons for genres
 genre_btn_frame = tk.Frame(check_frame)
-genre_btn_frame.grid(row=row+1, column=0, columnspan=8, pady=5)
+
+def build_genre_checks(all_genres):  #filled in once the catalog has loaded
+    col = row = 0  
+    for g in all_genres:  
+        v = tk.BooleanVar()  
+        tk.Checkbutton(check_frame, text=g, variable=v, font=("Segoe UI", 9)).grid(row=row, column=col, sticky="w", padx=2, pady=1)  
+        genre_vars[g] = v 
+        col += 1  
+        if col >= 8:  # Increased to 8 columns for better layout
+            col = 0  
+            row += 1
+
+    # Add select all/none buttons for genres
+    genre_btn_frame.grid(row=row+1, column=0, columnspan=8, pady=5)
 
 def select_all_genres():
     for var in genre_vars.values():
@@ -295,62 +215,40 @@ tk.Button(genre_btn_frame, text="Select All Genres", command=select_all_genres,
 tk.Button(genre_btn_frame, text="Clear All Genres", command=clear_all_genres,
          font=("Segoe UI", 9)).pack(side="left", padx=5)
 
+# Compute runs on the worker thread (lab7_core) with a snapshot of the session
+
 def content_recs():  #content
-    if not require_login() or not liked_movies:  
+    if not require_login() or not session.liked:  
         show_text("Like a movie first")
         return  
-    base_mid = liked_movies[-1]  #base
-    base_idx = movies[movies.movieId == base_mid].index[0]  
-    recs = []  
-    if CONTENT_MODE == "sklearn":  
-        _, idxs = knn.kneighbors(genres_matrix[base_idx], n_neighbors=25)  #neighbors
-        for idx in idxs[0][1:]: 
-            r = movies.iloc[idx]  
-            if r.movieId not in disliked_movies:  
-                recs.append(r)  #append
-    else: 
-        base_genres = set(movies.at[base_idx, 'genres'].split('|'))  
-        for _, r in movies.iterrows():  
-            if r.movieId in disliked_movies: continue  
-            if base_genres & set(r.genres.split('|')):  
-                recs.append(r)  
-    render_results(pd.DataFrame(recs).head(20))  
+    run_query(core.content_rows, *session.snapshot(), render=render_rows)  
 
 def collaborative_recs(): 
-    if not require_login() or not liked_movies: 
+    if not require_login() or not session.liked: 
         show_text("Like a movie first")
         return  
-    liked_genres = set() 
-    for mid in liked_movies:  
-        liked_genres.update(movies[movies.movieId == mid].iloc[0].genres.split('|'))
-    scored = [] 
-    for _, r in movies.iterrows():  
-        if r.movieId in liked_movies or r.movieId in disliked_movies:  
-            continue 
-        overlap = len(liked_genres & set(r.genres.split('|')))  #overlap
-        if overlap:  
-            scored.append((overlap * 2 + r.avg_rating, r))  #score
-    scored.sort(key=lambda x: x[0], reverse=True)  #sort
-    render_results(pd.DataFrame([r for _, r in scored[:20]]))  
+    run_query(core.collaborative_rows, *session.snapshot(), render=render_rows)  
 
 def hybrid_recs():  #hybrid
-    if not require_login() or not liked_movies: 
+    if not require_login() or not session.liked: 
+        show_text("Like a movie first")  
+        return  
+    run_query(core.hybrid_rows, *session.snapshot(), render=render_rows)  
+
+def als_recs():  #als
+    if not require_login() or not session.liked: 
         show_text("Like a movie first")  
         return  
-    base_mid = liked_movies[-1]  
-    base_idx = movies[movies.movieId == base_mid].index[0]  #index
-    content_idxs = set()  
-    if CONTENT_MODE == "sklearn":  
-        _, idxs = knn.kneighbors(genres_matrix[base_idx], n_neighbors=30)  #neighbors
-        content_idxs = set(idxs[0][1:])  
-    hybrid = []  #list
-    for idx, r in movies.iterrows():  #loop
-        if r.movieId in liked_movies or r.movieId in disliked_movies:  
-            continue  #skip
-        score = (1 if idx in content_idxs else 0) + (r.avg_rating / 5) * 0.6  #score
-        hybrid.append((score, r)) 
-    hybrid.sort(key=lambda x: x[0], reverse=True)  #sort
-    render_results(pd.DataFrame([r for _, r in hybrid[:20]])) 
+    if core.als_model is None:  
+        show_text("ALS model unavailable")  
+        return  
+    run_query(core.als_rows, *session.snapshot(), render=render_rows)  
+
+def show_movie_list(which):  #liked/disliked
+    if not require_login():  
+        return  
+    mids = session.liked if which == "liked" else session.disliked  
+    render_results(core.movies[core.movies.movieId.isin(mids)])  
 
 # Recommendation buttons frame
 btns = tk.Frame(root)  
@@ -362,13 +260,41 @@ tk.Button(btns, text="Collaborative Recommendations", command=collaborative_recs
          font=("Segoe UI", 10), bg="#FF9800", fg="white").pack(side="left", padx=5)  
 tk.Button(btns, text="Hybrid Recommendations", command=hybrid_recs,
          font=("Segoe UI", 10), bg="#9C27B0", fg="white").pack(side="left", padx=5)  
+tk.Button(btns, text="ALS Recommendations", command=als_recs,
+         font=("Segoe UI", 10), bg="#607D8B", fg="white").pack(side="left", padx=5)  
 
 # Liked/Disliked movies buttons
 tk.Button(btns, text="⭐ Liked Movies", 
-         command=lambda: render_results(movies[movies.movieId.isin(liked_movies)]),
+         command=lambda: show_movie_list("liked"),
          font=("Segoe UI", 10)).pack(side="right", padx=5)  
 tk.Button(btns, text="👎 Disliked Movies", 
-         command=lambda: render_results(movies[movies.movieId.isin(disliked_movies)]),
+         command=lambda: show_movie_list("disliked"),
          font=("Segoe UI", 10)).pack(side="right", padx=5)  
 
+def core_ready(core):  #ready
+    build_genre_checks(core.all_genres)  
+    show_text(f"Loaded {len(core.movies):,} movies.")  
+    if "--profile" in sys.argv:  
+        print(f"ready after {time.perf_counter() - START:.2f}s: " +
+              ", ".join(f"{k} {v:.2f}s" for k, v in core.timings.items()))
+
+def core_failed(e):  #failed
+    messagebox.showerror("File error", str(e)) 
+    root.destroy()  
+
+show_text("Loading movies and models...")  
+executor.submit(core.load, on_result=core_ready, on_error=core_failed, channel="load")  #background load
+if "--profile" in sys.argv:  
+    root.after_idle(lambda: print(f"first window after {time.perf_counter() - START:.2f}s"))
+
+def flush_sessions():  #batched writes
+    store.flush()  
+    root.after(2000, flush_sessions)  
+
+def close_app():  #close
+    store.close()  
+    root.destroy()  
+
+root.after(2000, flush_sessions)  
+root.protocol("WM_DELETE_WINDOW", close_app)  
 root.mainloop()  #main
\ No newline at end of file
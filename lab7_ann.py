@@ -0,0 +1,209 @@
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+BASE = Path(__file__).parent
+INDEX_PATH = BASE / "content_lsh.npz"
+
+
+def _normalize_rows(matrix):
+    matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    return sparse.csr_matrix(sparse.diags(scale.astype(np.float32)) @ matrix)
+
+
+def matrix_digest(matrix):
+    """Digest of a sparse matrix's shape and contents, to tell whether a saved index still matches it."""
+    matrix = sparse.csr_matrix(matrix, dtype=np.float32)
+    matrix.sum_duplicates()
+    digest = hashlib.blake2b(np.asarray(matrix.shape, dtype=np.int64).tobytes(), digest_size=16)
+    for part in (matrix.indptr, matrix.indices, matrix.data):
+        digest.update(np.ascontiguousarray(part).tobytes())
+    return digest.hexdigest()
+
+
+def _top_k(similarities, k):
+    """(distances, indices) of the k most similar columns per row, nearest first."""
+    k = min(k, similarities.shape[1])
+    top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    sims = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-sims, axis=1, kind="stable")
+    return 1 - np.take_along_axis(sims, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class BruteForceIndex:
+    """Exact cosine neighbours by scanning every row (same answers as
+    NearestNeighbors(metric="cosine", algorithm="brute"))."""
+
+    def __init__(self, matrix, batch_size=256):
+        self.matrix = _normalize_rows(matrix)
+        self.batch_size = batch_size
+
+    def kneighbors(self, queries, n_neighbors=25):
+        queries = _normalize_rows(queries)
+        distances, indices = [], []
+        for start in range(0, queries.shape[0], self.batch_size):
+            sims = (queries[start:start + self.batch_size] @ self.matrix.T).toarray()
+            d, i = _top_k(sims, n_neighbors)
+            distances.append(d)
+            indices.append(i)
+        return np.vstack(distances), np.vstack(indices)
+
+
+class LSHIndex:
+    """Random-hyperplane LSH for cosine similarity, with exact re-ranking.
+
+    Each of n_tables hashes a row to n_bits sign bits. A query looks up its
+    own bucket plus n_probes neighbouring buckets per table (flipping the
+    least certain bits), then ranks the candidates exactly. More tables or
+    probes raise recall; fewer bits make buckets larger. max_candidates
+    bounds the re-ranking work per query. digest identifies the matrix the
+    index was built from (see matrix_digest).
+    """
+
+    def __init__(self, matrix, projections, n_bits, max_candidates=5000, n_probes=2, digest=None):
+        self.digest = digest or matrix_digest(matrix)
+        self.matrix = _normalize_rows(matrix)
+        self.projections = projections
+        self.n_bits = n_bits
+        self.n_tables = projections.shape[1] // n_bits
+        self.max_candidates = max_candidates
+        self.n_probes = n_probes
+        self._weights = (1 << np.arange(n_bits, dtype=np.int64))
+        codes, _ = self._hash(self.matrix)
+        self.order = np.argsort(codes, axis=0, kind="stable").astype(np.int32)
+        self.sorted_codes = np.take_along_axis(codes, self.order, axis=0)
+
+    @classmethod
+    def build(cls, matrix, n_tables=8, n_bits=12, seed=0, **params):
+        rng = np.random.default_rng(seed)
+        projections = rng.standard_normal((matrix.shape[1], n_tables * n_bits)).astype(np.float32)
+        return cls(matrix, projections, n_bits, **params)
+
+    def _hash(self, matrix):
+        """Bucket codes (rows x tables) and per-bit projection margins."""
+        projected = np.asarray(matrix @ self.projections).reshape(matrix.shape[0], self.n_tables, self.n_bits)
+        codes = ((projected > 0) * self._weights).sum(axis=2)
+        return codes, np.abs(projected)
+
+    def _candidates(self, codes, margins):
+        """Rows sharing a probed bucket with the query, for one query."""
+        found = []
+        for t in range(self.n_tables):
+            probes = [codes[t]]
+            for bit in np.argsort(margins[t])[:self.n_probes]:
+                probes.append(codes[t] ^ (1 << int(bit)))
+            probes = np.array(probes, dtype=np.int64)
+            lo = np.searchsorted(self.sorted_codes[:, t], probes, side="left")
+            hi = np.searchsorted(self.sorted_codes[:, t], probes, side="right")
+            found.extend(self.order[a:b, t] for a, b in zip(lo, hi) if b > a)
+        if not found:
+            return np.zeros(0, dtype=np.int32)
+        candidates, hits = np.unique(np.concatenate(found), return_counts=True)
+        if len(candidates) > self.max_candidates:
+            # Rows that collide in more tables are more likely to be close
+            candidates = candidates[np.argsort(-hits, kind="stable")[:self.max_candidates]]
+        return candidates
+
+    def kneighbors(self, queries, n_neighbors=25):
+        queries = _normalize_rows(queries)
+        codes, margins = self._hash(queries)
+        distances = np.full((queries.shape[0], n_neighbors), np.inf)
+        indices = np.full((queries.shape[0], n_neighbors), -1, dtype=np.int64)
+        for q in range(queries.shape[0]):
+            candidates = self._candidates(codes[q], margins[q])
+            if len(candidates) == 0:
+                continue
+            sims = (self.matrix[candidates] @ queries[q].T).toarray().T
+            d, i = _top_k(sims, n_neighbors)
+            distances[q, :d.shape[1]] = d[0]
+            indices[q, :i.shape[1]] = candidates[i[0]]
+        return distances, indices
+
+    def save(self, path=INDEX_PATH):
+        np.savez(path, data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr,
+                 shape=self.matrix.shape, projections=self.projections, n_bits=self.n_bits,
+                 max_candidates=self.max_candidates, n_probes=self.n_probes, digest=self.digest)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, **params):
+        data = np.load(path)
+        matrix = sparse.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"]))
+        settings = {"max_candidates": int(data["max_candidates"]), "n_probes": int(data["n_probes"]),
+                    "digest": str(data["digest"]) if "digest" in data else None}
+        settings.update(params)
+        return cls(matrix, data["projections"], int(data["n_bits"]), **settings)
+
+
+def make_index(kind, matrix, path=INDEX_PATH, **params):
+    """Neighbour backend by name: "brute" (exact) or "lsh" (loaded from path when it was built from
+    the same matrix, else rebuilt and saved)."""
+    if kind == "brute":
+        return BruteForceIndex(matrix)
+    if kind == "lsh":
+        path = Path(path)
+        if path.exists():
+            index = LSHIndex.load(path)
+            if index.digest == matrix_digest(matrix):
+                return index
+        index = LSHIndex.build(matrix, **params)
+        index.save(path)
+        return index
+    raise ValueError(f"Unknown neighbour backend: {kind}")
+
+
+def merge_neighbors(distances, indices, excluded, k):
+    """Best k rows over several seeds' neighbour lists, nearest first, skipping excluded rows."""
+    distances, indices = distances.ravel(), indices.ravel()
+    valid = indices >= 0
+    distances, indices = distances[valid], indices[valid]
+    order = np.argsort(distances, kind="stable")
+    rows = indices[order]
+    _, first = np.unique(rows, return_index=True)
+    rows = rows[np.sort(first)]
+    return rows[~excluded[rows]][:k]
+
+
+def recall_at_k(exact, approx, k):
+    """Tie-aware recall: a returned row counts if it is as close as the exact k-th neighbour."""
+    exact_d, _ = exact
+    approx_d, _ = approx
+    kth = exact_d[:, k - 1:k] + 1e-6
+    return float(np.mean((approx_d[:, :k] <= kth).sum(axis=1) / k))
+
+
+def benchmark(movies_csv=BASE / "movies.csv", n_queries=200, k=25):
+    """recall@k and per-query latency of LSH settings against brute force."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    movies = pd.read_csv(movies_csv)
+    matrix = TfidfVectorizer(stop_words="english").fit_transform(movies["genres"].fillna("").astype(str))
+    rng = np.random.default_rng(0)
+    queries = matrix[rng.choice(matrix.shape[0], n_queries, replace=False)]
+
+    brute = BruteForceIndex(matrix)
+    start = time.perf_counter()
+    exact = brute.kneighbors(queries, k)
+    brute_ms = (time.perf_counter() - start) / n_queries * 1000
+    print(f"Catalog: {matrix.shape[0]:,} movies, {n_queries} queries, k={k}")
+    print(f"brute force                      {brute_ms:7.3f} ms/query  recall@{k} 1.000")
+
+    for n_tables, n_bits, n_probes in ((4, 12, 0), (8, 12, 2), (16, 10, 2)):
+        start = time.perf_counter()
+        index = LSHIndex.build(matrix, n_tables=n_tables, n_bits=n_bits, n_probes=n_probes)
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        approx = index.kneighbors(queries, k)
+        ms = (time.perf_counter() - start) / n_queries * 1000
+        print(f"lsh tables={n_tables:2d} bits={n_bits} probes={n_probes}  {ms:7.3f} ms/query  "
+              f"recall@{k} {recall_at_k(exact, approx, k):.3f}  (build {build_s:.2f}s)")
+
+
+if __name__ == "__main__":
+    benchmark(*sys.argv[1:2])
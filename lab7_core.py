@@ -0,0 +1,298 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE = Path(__file__).parent
+MOVIES_CSV = BASE / "movies.csv"
+RATINGS_CSV = BASE / "ratings.csv"
+
+
+def average_ratings(movies, ratings):
+    """Mean rating per movie row (0.0 for unrated), via one groupby and a map."""
+    means = ratings.groupby("movieId")["rating"].mean()
+    return movies["movieId"].map(means).fillna(0.0).astype(float)
+
+
+class RecommenderCore:
+    """Catalog, indexes and models behind the lab7 UI, with no UI dependency.
+
+    Importing this module reads nothing. load() reads the CSVs and builds or
+    loads every model once (thread-safe, later calls return immediately) and
+    sets the ready event; timings holds the seconds spent in each stage. The
+    query methods take plain lists of movieIds, so the same object can serve
+    the Tk app, a web service or a batch job.
+    """
+
+    def __init__(self, movies_csv=MOVIES_CSV, ratings_csv=RATINGS_CSV, neighbor_backend="brute",
+                 model_dir=BASE):
+        self.movies_csv = Path(movies_csv)
+        self.ratings_csv = Path(ratings_csv)
+        self.neighbor_backend = neighbor_backend
+        self.model_dir = Path(model_dir)  # where saved models are read from and written to
+        self.ready = threading.Event()
+        self.timings = {}
+        self._lock = threading.Lock()
+        self.content_mode = "fallback"
+        self.genres_matrix = self.knn = self.item_cf = self.als_model = self.sim_table = None
+
+    def load(self):
+        with self._lock:
+            if not self.ready.is_set():
+                for name, stage in (("catalog", self._load_catalog), ("content", self._load_content),
+                                    ("item_cf", self._load_item_cf), ("als", self._load_als),
+                                    ("sim_table", self._load_sim_table)):
+                    start = time.perf_counter()
+                    stage()
+                    self.timings[name] = time.perf_counter() - start
+                self.ready.set()
+        return self
+
+    def __getstate__(self):
+        """Pickled cores (e.g. sent to worker processes) keep the catalog,
+        indexes and models but not the ratings frame, which only load() reads;
+        the similarity table is reopened as a memory map on the other side."""
+        state = self.__dict__.copy()
+        state["loaded"] = self.ready.is_set()
+        state["ratings"] = state["sim_table"] = None
+        del state["_lock"], state["ready"]
+        return state
+
+    def __setstate__(self, state):
+        loaded = state.pop("loaded")
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.ready = threading.Event()
+        if loaded:
+            self._load_sim_table()
+            self.ready.set()
+
+    def load_in_background(self):
+        """Start load() on a daemon thread; wait on self.ready (or join) for it."""
+        thread = threading.Thread(target=self.load, name="lab7-load", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_catalog(self):
+        from lab7_search import TitleSearchIndex
+
+        movies = pd.read_csv(self.movies_csv)
+        self.ratings = pd.read_csv(self.ratings_csv, usecols=["userId", "movieId", "rating"],
+                                   dtype={"userId": np.int32, "movieId": np.int32, "rating": np.float32})
+        movies["avg_rating"] = average_ratings(movies, self.ratings)
+        movies["genres"] = movies["genres"].fillna("").astype(str)
+        self.movies = movies
+        self.all_genres = sorted({g for gs in movies["genres"] for g in gs.split("|")
+                                  if g and g != "(no genres listed)"})
+        self.search_index = TitleSearchIndex.from_movies(movies)
+        self.movie_index = pd.Index(movies["movieId"])
+        self.movie_ids = movies["movieId"].to_numpy()
+        self.avg_rating_values = movies["avg_rating"].to_numpy()
+
+    def _load_content(self):
+        try:
+            from lab7_ann import INDEX_PATH, make_index
+            from lab7_simtable import genre_tfidf
+            self.genres_matrix = genre_tfidf(self.movies["genres"])
+            self.knn = make_index(self.neighbor_backend, self.genres_matrix, self.model_dir / INDEX_PATH.name)
+            self.content_mode = "sklearn"
+        except Exception:
+            self.content_mode = "fallback"
+            self.genres_matrix = self.knn = None
+
+    def _load_item_cf(self):
+        try:
+            from lab7_itemcf import MODEL_PATH, ItemCF
+            self.item_cf = ItemCF.load_or_build(self.ratings, self.movie_ids, self.model_dir / MODEL_PATH.name,
+                                                source=self.ratings_csv)
+        except Exception:
+            self.item_cf = None
+
+    def _load_als(self):
+        try:
+            from lab7_als import MODEL_PATH, ALSModel
+            self.als_model = ALSModel.load_or_train(self.ratings, self.movie_ids, self.model_dir / MODEL_PATH.name,
+                                                    source=self.ratings_csv)
+        except Exception:
+            self.als_model = None
+
+    def _load_sim_table(self):
+        from lab7_simtable import TABLE_DIR, SimilarityTable
+        # Content lookups ask for up to 30 neighbours per seed (hybrid_rows)
+        self.sim_table = SimilarityTable.open_matching(self.movie_ids, self.model_dir / TABLE_DIR.name,
+                                                       content=self.genres_matrix,
+                                                       min_neighbors=min(30, len(self.movie_ids) - 1))
+
+    def movie_rows(self, mids):
+        rows = self.movie_index.get_indexer(list(mids))
+        return rows[rows >= 0]
+
+    def exclusion(self, *id_lists):
+        """Row mask of the given movieIds; same as lab7_recs.exclusion_mask via the row index."""
+        mask = np.zeros(len(self.movie_ids), dtype=bool)
+        for ids in id_lists:
+            mask[self.movie_rows(ids)] = True
+        return mask
+
+    def seed_neighbors(self, rows, n):
+        if self.sim_table is not None:
+            return self.sim_table.kneighbors_rows(rows, n)
+        return self.knn.kneighbors(self.genres_matrix[rows], n_neighbors=n)
+
+    def search(self, terms, genres=()):
+        """Rows matching ANY term and ALL genres, by relevance."""
+        return self.search_index.search(terms, genres)
+
+    def search_batch(self, queries, limit=None):
+        """search() for many (terms, genres) queries, sharing term lookups."""
+        return self.search_index.search_batch(queries, limit)
+
+    def content_rows(self, liked, disliked, k=20):
+        from lab7_ann import merge_neighbors
+        from lab7_recs import genre_overlap_rows
+
+        # Liked ids missing from the catalog (a stale session, an HTTP
+        # client) are ignored; with none left there is nothing to go on
+        seeds = self.movie_rows(liked)
+        if len(seeds) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self.content_mode == "sklearn":
+            excluded = self.exclusion(liked, disliked)
+            dists, idxs = self.seed_neighbors(seeds, k + 5)
+            return merge_neighbors(dists, idxs, excluded, k)
+        excluded = self.exclusion(disliked)
+        return genre_overlap_rows(self.search_index.genre_matrix, seeds[-1], excluded, k)
+
+    def collaborative_rows(self, liked, disliked, k=20):
+        from lab7_recs import genre_collaborative_rows
+
+        if self.item_cf is not None:
+            rows = self.item_cf.recommend(self.movie_rows(liked), self.movie_rows(disliked), k=k)
+            if len(rows):
+                return rows
+        excluded = self.exclusion(liked, disliked)
+        return genre_collaborative_rows(self.search_index.genre_matrix, self.avg_rating_values,
+                                        self.movie_rows(liked), excluded, k)
+
+    def hybrid_rows(self, liked, disliked, k=20):
+        from lab7_ann import merge_neighbors
+        from lab7_recs import hybrid_rows
+
+        excluded = self.exclusion(liked, disliked)
+        content_idxs = []
+        seeds = self.movie_rows(liked)
+        if self.content_mode == "sklearn" and len(seeds):
+            dists, idxs = self.seed_neighbors(seeds, 30)
+            content_idxs = merge_neighbors(dists, idxs, excluded, 29)
+        return hybrid_rows(self.avg_rating_values, content_idxs, excluded, k)
+
+    def als_rows(self, liked, disliked, k=20):
+        return self.als_model.recommend(self.movie_rows(liked), self.movie_rows(disliked), k=k)
+
+    def recommend_batch(self, mode, queries, k=20):
+        """Rows for many (liked, disliked) queries of one mode, sharing the heavy call.
+
+        content and hybrid look up every query's seeds with one neighbour
+        call; collaborative scores every query with one bincount over the
+        item neighbour lists (and one genre-overlap product for the queries
+        that fall back); als folds each query in and scores them all with
+        one matrix product. Results match calling the per-query method for
+        each.
+        """
+        from scipy import sparse
+        from lab7_ann import merge_neighbors
+        from lab7_recs import genre_collaborative_batch, hybrid_rows
+
+        if mode in ("content", "hybrid") and self.content_mode == "sklearn":
+            seeds = [self.movie_rows(liked) for liked, _ in queries]
+            all_seeds = np.concatenate(seeds)
+            n_neighbors = k + 5 if mode == "content" else 30
+            if len(all_seeds):
+                dists, idxs = self.seed_neighbors(all_seeds, n_neighbors)
+            elif mode == "content":
+                return [np.zeros(0, dtype=np.int64) for _ in queries]
+            else:  # hybrid still ranks by rating without content neighbours
+                dists, idxs = np.zeros((0, n_neighbors)), np.zeros((0, n_neighbors), dtype=np.int64)
+            splits = np.cumsum([len(s) for s in seeds])[:-1]
+            out = []
+            for (liked, disliked), d, i in zip(queries, np.split(dists, splits), np.split(idxs, splits)):
+                excluded = self.exclusion(liked, disliked)
+                if mode == "content":
+                    out.append(merge_neighbors(d, i, excluded, k))
+                else:
+                    out.append(hybrid_rows(self.avg_rating_values, merge_neighbors(d, i, excluded, 29),
+                                           excluded, k))
+            return out
+        if mode == "collaborative":
+            liked = [self.movie_rows(l) for l, _ in queries]
+            disliked = [self.movie_rows(d) for _, d in queries]
+            if self.item_cf is not None:
+                out = self.item_cf.recommend_batch(liked, disliked, k)
+            else:
+                out = [np.zeros(0, dtype=np.int64) for _ in queries]
+            empty = [q for q in range(len(queries)) if len(out[q]) == 0]
+            fallback = genre_collaborative_batch(self.search_index.genre_matrix, self.avg_rating_values,
+                                                 [liked[q] for q in empty],
+                                                 [self.exclusion(*queries[q]) for q in empty], k)
+            for q, rows in zip(empty, fallback):
+                out[q] = rows
+            return out
+        if mode == "als" and self.als_model is not None:
+            liked = [self.movie_rows(l) for l, _ in queries]
+            disliked = [self.movie_rows(d) for _, d in queries]
+            live = [q for q in range(len(queries)) if len(liked[q])]
+            out = [np.zeros(0, dtype=np.int64) for _ in queries]
+            if live:
+                factors = np.vstack([self.als_model.fold_in(liked[q], disliked[q]) for q in live])
+                seen = [np.concatenate([liked[q], disliked[q]]) for q in live]
+                exclude = sparse.csr_matrix(
+                    (np.ones(sum(map(len, seen))), np.concatenate(seen),
+                     np.concatenate([[0], np.cumsum([len(s) for s in seen])])),
+                    shape=(len(live), len(self.movie_ids)))
+                for q, rows in zip(live, self.als_model.recommend_batch(factors, k, exclude)):
+                    out[q] = rows[rows >= 0]
+            return out
+        single = {"content": self.content_rows, "collaborative": self.collaborative_rows,
+                  "hybrid": self.hybrid_rows, "als": self.als_rows}[mode]
+        return [single(liked, disliked, k) for liked, disliked in queries]
+
+
+def startup_profile(movies_csv=MOVIES_CSV, ratings_csv=RATINGS_CSV):
+    """Import time of this module and of lab7-1.py's imports, and each load() stage.
+
+    Imports are timed in fresh interpreters. Time to first window is the
+    import time of lab7-1.py's modules plus building the widgets, since
+    loading now runs after the window is up (run lab7-1.py --profile to see
+    it measured).
+    """
+    for name, code in (("import lab7_core", "import lab7_core"),
+                       ("lab7-1.py imports", "import tkinter, lab7_core, lab7_worker, lab7_resultview")):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=BASE, check=True)
+        print(f"{name:20s} {time.perf_counter() - start:7.3f}s (incl. interpreter start)")
+
+    core = RecommenderCore(movies_csv, ratings_csv)
+    start = time.perf_counter()
+    core.load()
+    total = time.perf_counter() - start
+    for name, seconds in core.timings.items():
+        print(f"load: {name:14s} {seconds:7.3f}s")
+    print(f"load: total          {total:7.3f}s (was all before the first window)")
+
+    start = time.perf_counter()
+    legacy = core.movies["movieId"].apply(
+        lambda x, means=core.ratings.groupby("movieId")["rating"].mean().to_dict(): float(means.get(x, 0.0)))
+    apply_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    vector = average_ratings(core.movies, core.ratings)
+    map_ms = (time.perf_counter() - start) * 1000
+    assert np.allclose(legacy.to_numpy(), vector.to_numpy())
+    print(f"avg_rating: groupby+apply {apply_ms:.1f} ms, groupby+map {map_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    startup_profile(*sys.argv[1:3])
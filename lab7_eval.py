@@ -0,0 +1,169 @@
+import math
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lab7_core import MOVIES_CSV, RATINGS_CSV, RecommenderCore
+
+MODES = ("content", "collaborative", "hybrid", "als")
+LIKED_RATING = 4.0     # ratings at or above count as liked / relevant
+DISLIKED_RATING = 2.0  # ratings at or below count as disliked
+
+
+def split_by_time(frame, test_fraction=0.2, min_ratings=5):
+    """(train, test): each user's latest test_fraction of ratings is held out.
+
+    Users with fewer than min_ratings ratings stay entirely in train.
+    """
+    frame = frame.sort_values(["userId", "timestamp"], kind="stable")
+    counts = frame.groupby("userId")["userId"].transform("size").to_numpy()
+    rank = frame.groupby("userId").cumcount().to_numpy()
+    test = (counts >= min_ratings) & (rank >= np.ceil(counts * (1 - test_fraction)))
+    return frame[~test], frame[test]
+
+
+def stream_user_splits(ratings_csv, test_fraction=0.2, min_ratings=5, chunksize=1_000_000):
+    """Yield (train, test) frames chunk by chunk, each holding whole users.
+
+    ratings.csv must be sorted by userId (MovieLens files are); only one
+    chunk plus the last user's carried-over rows are in memory at a time.
+    """
+    carry, last_seen = None, -1
+    for chunk in pd.read_csv(ratings_csv, chunksize=chunksize,
+                             dtype={"userId": np.int32, "movieId": np.int32,
+                                    "rating": np.float32, "timestamp": np.int64}):
+        users = chunk["userId"].to_numpy()
+        if users[0] < last_seen or np.any(np.diff(users) < 0):
+            raise ValueError("ratings.csv must be sorted by userId for streaming evaluation")
+        last_seen = users[-1]
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        tail = chunk["userId"].to_numpy() == last_seen
+        carry, chunk = chunk[tail], chunk[~tail]
+        if len(chunk):
+            yield split_by_time(chunk, test_fraction, min_ratings)
+    if carry is not None and len(carry):
+        yield split_by_time(carry, test_fraction, min_ratings)
+
+
+def sample_eval_users(train, test, reservoir, seen, rng, max_users, max_seeds=10):
+    """Add this chunk's users to a reservoir sample of (liked, disliked, relevant).
+
+    liked is the user's latest max_seeds train likes (a UI session's worth),
+    disliked their train dislikes, relevant their held-out likes.
+    """
+    relevant = test[test["rating"] >= LIKED_RATING].groupby("userId")["movieId"].agg(tuple)
+    liked = train[train["rating"] >= LIKED_RATING].groupby("userId")["movieId"].agg(
+        lambda m: tuple(m.iloc[-max_seeds:]))
+    disliked = train[train["rating"] <= DISLIKED_RATING].groupby("userId")["movieId"].agg(tuple)
+    for user in relevant.index.intersection(liked.index):
+        entry = (liked[user], disliked.get(user, ()), relevant[user])
+        if len(reservoir) < max_users:
+            reservoir.append(entry)
+        else:
+            j = rng.integers(seen + 1)
+            if j < max_users:
+                reservoir[j] = entry
+        seen += 1
+    return seen
+
+
+def score_user(recommended, relevant, k):
+    """(precision@k, recall@k, NDCG@k) with binary relevance."""
+    relevant = set(relevant)
+    hits = [i for i, m in enumerate(recommended[:k]) if m in relevant]
+    dcg = sum(1 / math.log2(i + 2) for i in hits)
+    idcg = sum(1 / math.log2(i + 2) for i in range(min(len(relevant), k)))
+    return len(hits) / k, len(hits) / len(relevant), dcg / idcg
+
+
+_core = None
+
+
+def _init_worker(core):
+    global _core
+    _core = core
+
+
+def _replay(mode, users, k):
+    """Run one mode for a slice of users; per-user metrics, latencies and recommended ids."""
+    recommend = {"content": _core.content_rows, "collaborative": _core.collaborative_rows,
+                 "hybrid": _core.hybrid_rows, "als": _core.als_rows}[mode]
+    scores, latencies, shown = [], [], set()
+    for liked, disliked, relevant in users:
+        start = time.perf_counter()
+        rows = recommend(liked, disliked, k)
+        latencies.append(time.perf_counter() - start)
+        ids = _core.movie_ids[np.asarray(rows, dtype=np.int64)].tolist()
+        shown.update(ids)
+        scores.append(score_user(ids, relevant, k))
+    return mode, scores, latencies, shown
+
+
+def evaluate(movies_csv=MOVIES_CSV, ratings_csv=RATINGS_CSV, k=10, max_users=2000, n_workers=4,
+             modes=MODES, test_fraction=0.2, chunksize=1_000_000, users_per_task=50, seed=0):
+    """Time-split ratings_csv per user, train on the past, replay sampled users through each mode.
+
+    The split streams ratings_csv chunk by chunk: train rows are appended to
+    a temporary CSV that the evaluation core trains on, and only a reservoir
+    sample of max_users test users is kept. Models are built once in this
+    process and the loaded core, without its ratings frame, is handed to the
+    n_workers replay processes (inherited on fork, pickled on spawn).
+    """
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        train_csv = Path(tmp) / "train.csv"
+        reservoir, seen, n_train, n_test = [], 0, 0, 0
+        start = time.perf_counter()
+        for i, (train, test) in enumerate(stream_user_splits(ratings_csv, test_fraction, chunksize=chunksize)):
+            train.to_csv(train_csv, mode="a", header=i == 0, index=False)
+            n_train, n_test = n_train + len(train), n_test + len(test)
+            seen = sample_eval_users(train, test, reservoir, seen, rng, max_users)
+        print(f"Split {n_train:,} train / {n_test:,} test ratings in {time.perf_counter() - start:.1f}s; "
+              f"replaying {len(reservoir):,} of {seen:,} users with held-out likes, k={k}")
+
+        start = time.perf_counter()
+        core = RecommenderCore(movies_csv, train_csv, model_dir=tmp).load()
+        print(f"Trained on the train split in {time.perf_counter() - start:.1f}s")
+        core.ratings = None  # only load() needs it; workers must not inherit it
+        modes = [m for m in modes if m != "als" or core.als_model is not None]
+        tasks = [(mode, reservoir[s:s + users_per_task], k)
+                 for mode in modes for s in range(0, len(reservoir), users_per_task)]
+
+        start = time.perf_counter()
+        if n_workers > 1:
+            with ProcessPoolExecutor(n_workers, initializer=_init_worker, initargs=(core,)) as pool:
+                results = list(pool.map(_replay, *zip(*tasks)))
+        else:
+            global _core
+            _core = core
+            results = [_replay(*task) for task in tasks]
+        replay_time = time.perf_counter() - start
+
+    print(f"Replay: {replay_time:.1f}s with {n_workers} worker(s)")
+    print(f"{'mode':14s} {'P@k':>7s} {'R@k':>7s} {'NDCG':>7s} {'coverage':>9s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for mode in modes:
+        scores, latencies, shown = [], [], set()
+        for m, s, l, ids in results:
+            if m == mode:
+                scores += s
+                latencies += l
+                shown |= ids
+        if not scores:  # an empty split, or no sampled user with held-out likes
+            print(f"{mode:14s} {'n/a':>7s} {'n/a':>7s} {'n/a':>7s} {'n/a':>9s} {'n/a':>8s} {'n/a':>8s} {'n/a':>8s}")
+            continue
+        p, r, n = np.mean(scores, axis=0)
+        ms = np.array(latencies) * 1000
+        print(f"{mode:14s} {p:7.4f} {r:7.4f} {n:7.4f} {len(shown) / len(core.movie_ids):9.2%} "
+              f"{np.percentile(ms, 50):8.2f} {np.percentile(ms, 95):8.2f} {np.percentile(ms, 99):8.2f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    evaluate(*args[:2], **({"n_workers": int(args[2])} if len(args) > 2 else {}))
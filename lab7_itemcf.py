@@ -0,0 +1,204 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+BASE = Path(__file__).parent
+MODEL_PATH = BASE / "itemcf_neighbors.npz"
+
+
+def load_ratings(ratings_csv, item_ids, chunksize=5_000_000):
+    """Stream ratings.csv into compact (user, item, rating) arrays.
+
+    Items are columns aligned with item_ids (the movies.csv order); ratings
+    for movies missing from item_ids are dropped.
+    """
+    item_index = pd.Index(item_ids)
+    users, items, values = [], [], []
+    for chunk in pd.read_csv(ratings_csv, usecols=["userId", "movieId", "rating"],
+                             dtype={"userId": np.int32, "movieId": np.int64, "rating": np.float32},
+                             chunksize=chunksize):
+        cols = item_index.get_indexer(chunk["movieId"].to_numpy())
+        keep = cols >= 0
+        users.append(chunk["userId"].to_numpy()[keep])
+        items.append(cols[keep].astype(np.int32))
+        values.append(chunk["rating"].to_numpy()[keep])
+    users = np.concatenate(users) if users else np.zeros(0, dtype=np.int32)
+    _, users = np.unique(users, return_inverse=True)
+    return (users.astype(np.int32),
+            np.concatenate(items) if items else np.zeros(0, dtype=np.int32),
+            np.concatenate(values) if values else np.zeros(0, dtype=np.float32))
+
+
+def rating_matrix(users, items, values, n_items, adjusted=True):
+    """Sparse user x item CSR matrix, mean-centred per user for adjusted cosine."""
+    n_users = int(users.max()) + 1 if len(users) else 0
+    matrix = sparse.csr_matrix((values.astype(np.float32), (users, items)), shape=(n_users, n_items))
+    matrix.sum_duplicates()
+    if adjusted and matrix.nnz:
+        counts = np.diff(matrix.indptr)
+        means = np.asarray(matrix.sum(axis=1)).ravel() / np.maximum(counts, 1)
+        matrix.data -= np.repeat(means, counts).astype(np.float32)
+    return matrix
+
+
+def normalize_items(matrix):
+    """Unit-length item columns as (user x item CSC, item x user CSR)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    normalized = (matrix @ sparse.diags(scale.astype(np.float32))).tocsc()
+    return normalized, normalized.T.tocsr()
+
+
+def build_item_neighbors(matrix, n_neighbors=50, block_size=256, n_jobs=1):
+    """Top-N cosine neighbours of every item column of a user x item matrix.
+
+    Similarities are computed a block of items at a time (block x items
+    sparse product) and trimmed to the top N straight from the sparse
+    result, so the dense item x item matrix is never materialized.
+    Returns (neighbors int32, similarities float32), both n_items x N, with
+    -1 / 0 padding where an item has fewer than N positive neighbours.
+    """
+    n_items = matrix.shape[1]
+    normalized, by_item = normalize_items(matrix)
+
+    n_neighbors = min(n_neighbors, max(n_items - 1, 1))
+    neighbors = np.full((n_items, n_neighbors), -1, dtype=np.int32)
+    similarities = np.zeros((n_items, n_neighbors), dtype=np.float32)
+
+    def run_block(start):
+        stop = min(start + block_size, n_items)
+        block = (by_item[start:stop] @ normalized).tocsr()
+        block.sum_duplicates()
+        rows = np.repeat(np.arange(stop - start), np.diff(block.indptr))
+        keep = (block.data > 0) & (block.indices != rows + start)
+        rows, cols, sims = rows[keep], block.indices[keep], block.data[keep]
+
+        # Sort each row's entries by similarity and keep the first N
+        order = np.lexsort((cols, -sims, rows))
+        rows, cols, sims = rows[order], cols[order], sims[order]
+        counts = np.bincount(rows, minlength=stop - start)
+        rank = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        top = rank < n_neighbors
+        neighbors[start + rows[top], rank[top]] = cols[top]
+        similarities[start + rows[top], rank[top]] = sims[top]
+
+    starts = range(0, n_items, block_size)
+    if n_jobs > 1:
+        # scipy's sparse products release the GIL, so threads share the matrix
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(run_block, starts))
+    else:
+        for start in starts:
+            run_block(start)
+    return neighbors, similarities
+
+
+class ItemCF:
+    """Item-item collaborative filtering over precomputed neighbour lists."""
+
+    def __init__(self, item_ids, neighbors, similarities):
+        self.item_ids = np.asarray(item_ids)
+        self.neighbors = neighbors
+        self.similarities = similarities
+
+    @classmethod
+    def build(cls, users, items, values, item_ids, n_neighbors=50, adjusted=True, block_size=256, n_jobs=1):
+        matrix = rating_matrix(users, items, values, len(item_ids), adjusted)
+        neighbors, similarities = build_item_neighbors(matrix, n_neighbors, block_size, n_jobs)
+        return cls(item_ids, neighbors, similarities)
+
+    @classmethod
+    def from_ratings_frame(cls, ratings, item_ids, **kwargs):
+        cols = pd.Index(item_ids).get_indexer(ratings["movieId"].to_numpy())
+        keep = cols >= 0
+        _, users = np.unique(ratings["userId"].to_numpy()[keep], return_inverse=True)
+        return cls.build(users.astype(np.int32), cols[keep].astype(np.int32),
+                         ratings["rating"].to_numpy(dtype=np.float32)[keep], item_ids, **kwargs)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        data = np.load(path)
+        return cls(data["item_ids"], data["neighbors"], data["similarities"])
+
+    @classmethod
+    def load_or_build(cls, ratings, item_ids, path=MODEL_PATH, source=None):
+        """Load a saved model for these items, or build one from ratings and save it."""
+        path = Path(path)
+        if path.exists() and (source is None or path.stat().st_mtime >= Path(source).stat().st_mtime):
+            model = cls.load(path)
+            if np.array_equal(model.item_ids, item_ids):
+                return model
+        model = cls.from_ratings_frame(ratings, item_ids)
+        model.save(path)
+        return model
+
+    def save(self, path=MODEL_PATH):
+        np.savez(path, item_ids=self.item_ids, neighbors=self.neighbors, similarities=self.similarities)
+
+    def recommend(self, liked_rows, excluded_rows=(), k=20):
+        """Rows scored by summed similarity to the liked rows, best first."""
+        return self.recommend_batch([liked_rows], [excluded_rows], k)[0]
+
+    def recommend_batch(self, liked_lists, excluded_lists, k=20):
+        """recommend() for many queries, scored with one bincount into a queries x items array."""
+        n_items = len(self.item_ids)
+        out = [np.zeros(0, dtype=np.int64) for _ in liked_lists]
+        live = [q for q, liked in enumerate(liked_lists) if len(liked)]
+        if not live:
+            return out
+        liked = [np.asarray(liked_lists[q], dtype=np.int64) for q in live]
+        all_liked = np.concatenate(liked)
+        owner = np.repeat(np.arange(len(live)), [len(rows) * self.neighbors.shape[1] for rows in liked])
+        neighbors = self.neighbors[all_liked].ravel()
+        valid = neighbors >= 0
+        scores = np.bincount(owner[valid] * n_items + neighbors[valid],
+                             weights=self.similarities[all_liked].ravel()[valid],
+                             minlength=len(live) * n_items).reshape(len(live), n_items)
+
+        for i, q in enumerate(live):
+            row = scores[i]
+            row[liked[i]] = 0
+            row[np.asarray(excluded_lists[q], dtype=np.int64)] = 0
+            candidates = np.flatnonzero(row > 0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-row[candidates], k - 1)[:k]]
+            out[q] = candidates[np.argsort(-row[candidates], kind="stable")]
+        return out
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return float("nan")
+
+
+def main(movies_csv=BASE / "movies.csv", ratings_csv=BASE / "ratings.csv", n_jobs=4):
+    """Offline build: stream ratings, compute neighbour lists, save MODEL_PATH."""
+    item_ids = pd.read_csv(movies_csv, usecols=["movieId"])["movieId"].to_numpy()
+
+    start = time.perf_counter()
+    users, items, values = load_ratings(ratings_csv, item_ids)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model = ItemCF.build(users, items, values, item_ids, n_jobs=int(n_jobs))
+    build_time = time.perf_counter() - start
+    model.save(MODEL_PATH)
+
+    print(f"Ratings: {len(values):,} from {int(users.max()) + 1 if len(users) else 0:,} users, "
+          f"{len(item_ids):,} items")
+    print(f"Load:  {load_time:.1f}s")
+    print(f"Build: {build_time:.1f}s ({n_jobs} thread(s))")
+    print(f"Peak RSS: {_peak_rss_mb():,.0f} MiB")
+    print(f"Saved {MODEL_PATH}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,131 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from lab7_search import TitleSearchIndex
+
+
+def exclusion_mask(movie_ids, *id_sets):
+    """Boolean mask of rows whose movieId is in any of the given sets."""
+    ids = set().union(*id_sets)
+    return np.isin(movie_ids, np.fromiter(ids, dtype=np.asarray(movie_ids).dtype, count=len(ids)))
+
+
+def top_k(scores, k, valid):
+    """Rows of the k best valid scores, highest first, ties in catalog order.
+
+    Matches a stable descending sort of the full list without sorting it.
+    """
+    rows = np.flatnonzero(valid)
+    if len(rows) > k:
+        values = scores[rows]
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = rows[values > kth]
+        ties = rows[values == kth][:k - len(above)]
+        rows = np.concatenate([above, ties])
+    return rows[np.lexsort((rows, -scores[rows]))]
+
+
+def genre_overlap_rows(genre_matrix, base_row, excluded, k=20):
+    """First k rows sharing a genre with base_row (content fallback)."""
+    shares = genre_matrix[:, genre_matrix[base_row]].any(axis=1) & ~excluded
+    return np.flatnonzero(shares)[:k]
+
+
+def genre_collaborative_rows(genre_matrix, avg_ratings, liked_rows, excluded, k=20):
+    """Rows ranked by 2 * (genres shared with the liked set) + average rating."""
+    liked_genres = genre_matrix[liked_rows].any(axis=0)
+    overlap = genre_matrix[:, liked_genres].sum(axis=1)
+    return top_k(overlap * 2 + avg_ratings, k, (overlap > 0) & ~excluded)
+
+
+def genre_collaborative_batch(genre_matrix, avg_ratings, liked_lists, excluded_masks, k=20):
+    """genre_collaborative_rows for many queries, with the genre overlaps as one matrix product."""
+    if not liked_lists:
+        return []
+    liked_genres = np.array([genre_matrix[rows].any(axis=0) for rows in liked_lists], dtype=np.float32)
+    overlaps = genre_matrix.astype(np.float32) @ liked_genres.T
+    return [top_k(overlap * 2 + avg_ratings, k, (overlap > 0) & ~excluded)
+            for overlap, excluded in zip(overlaps.T.astype(np.int64), excluded_masks)]
+
+
+def hybrid_rows(avg_ratings, content_rows, excluded, k=20):
+    """Rows ranked by content-neighbour membership plus 0.6 * rating / 5."""
+    in_content = np.zeros(len(avg_ratings))
+    in_content[content_rows] = 1
+    return top_k(in_content + (avg_ratings / 5) * 0.6, k, ~excluded)
+
+
+def benchmark(movies_csv="movies.csv", ratings_csv="ratings.csv", n_liked=10, repeats=20):
+    """Time each vectorized mode against the row-by-row iterrows version."""
+    movies = pd.read_csv(movies_csv)
+    ratings = pd.read_csv(ratings_csv)
+    movies["genres"] = movies["genres"].fillna("").astype(str)
+    movies["avg_rating"] = movies["movieId"].map(ratings.groupby("movieId")["rating"].mean()).fillna(0.0)
+
+    index = TitleSearchIndex.from_movies(movies)
+    genre_matrix, avg_ratings = index.genre_matrix, movies["avg_rating"].to_numpy()
+    movie_ids = movies["movieId"].to_numpy()
+
+    rng = np.random.default_rng(0)
+    liked_rows = rng.choice(len(movies), n_liked, replace=False)
+    liked, disliked = list(movie_ids[liked_rows[:-2]]), list(movie_ids[liked_rows[-2:]])
+    content_rows = rng.choice(len(movies), 29, replace=False)
+
+    def legacy_content():
+        base_genres = set(movies.at[liked_rows[-3], "genres"].split("|"))
+        return [r for _, r in movies.iterrows()
+                if r.movieId not in disliked and base_genres & set(r.genres.split("|"))][:20]
+
+    def legacy_collaborative():
+        liked_genres = set()
+        for mid in liked:
+            liked_genres.update(movies[movies.movieId == mid].iloc[0].genres.split("|"))
+        scored = []
+        for _, r in movies.iterrows():
+            if r.movieId in liked or r.movieId in disliked:
+                continue
+            overlap = len(liked_genres & set(r.genres.split("|")))
+            if overlap:
+                scored.append((overlap * 2 + r.avg_rating, r))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored[:20]
+
+    def legacy_hybrid():
+        content = set(content_rows)
+        hybrid = []
+        for idx, r in movies.iterrows():
+            if r.movieId in liked or r.movieId in disliked:
+                continue
+            hybrid.append(((1 if idx in content else 0) + (r.avg_rating / 5) * 0.6, r))
+        hybrid.sort(key=lambda x: x[0], reverse=True)
+        return hybrid[:20]
+
+    def vector_content():
+        return genre_overlap_rows(genre_matrix, liked_rows[-3], exclusion_mask(movie_ids, disliked))
+
+    def vector_collaborative():
+        excluded = exclusion_mask(movie_ids, liked, disliked)
+        return genre_collaborative_rows(genre_matrix, avg_ratings, liked_rows[:-2], excluded)
+
+    def vector_hybrid():
+        return hybrid_rows(avg_ratings, content_rows, exclusion_mask(movie_ids, liked, disliked))
+
+    print(f"Catalog: {len(movies):,} movies, {len(liked)} liked, {len(disliked)} disliked")
+    for name, legacy, vector in (("content (fallback)", legacy_content, vector_content),
+                                 ("collaborative (genre)", legacy_collaborative, vector_collaborative),
+                                 ("hybrid", legacy_hybrid, vector_hybrid)):
+        start = time.perf_counter()
+        legacy()
+        legacy_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(repeats):
+            vector()
+        vector_ms = (time.perf_counter() - start) / repeats * 1000
+        print(f"{name:22s} iterrows {legacy_ms:9.1f} ms   vectorized {vector_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*sys.argv[1:3])
@@ -0,0 +1,172 @@
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+ROW_COLORS = {"liked": "#e8f5e9", "disliked": "#ffebee", None: ""}
+
+
+class ResultList(tk.Frame):
+    """Scrollable movie list that only creates widgets for the visible rows.
+
+    A fixed pool of row widgets, one per row that fits in the viewport, is
+    rebound to a slice of the results whenever the list scrolls or resizes,
+    so the widget count does not depend on the number of results. Like and
+    Dislike update the clicked row in place instead of rebuilding the list.
+    """
+
+    def __init__(self, parent, on_like, on_dislike, state_of, row_height=34, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_like = on_like
+        self.on_dislike = on_dislike
+        self.state_of = state_of  # movieId -> "liked" / "disliked" / None
+        self.row_height = row_height
+        self.offset = 0
+        self.movie_ids = np.zeros(0, dtype=np.int64)
+        self.titles = self.genres = self.ratings = self.movie_ids
+        self.slots = []
+
+        self.header = tk.Frame(self)
+        self.header.pack(fill="x")
+        self.terms_label = tk.Label(self.header, font=("Segoe UI", 9, "italic"), bg="#f0f0f0", anchor="w")
+        self.count_label = tk.Label(self.header, font=("Segoe UI", 10, "bold"), anchor="w")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = tk.Frame(self)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", lambda e: self._resize(e.height))
+        self.message = tk.Label(self.body, justify="left", anchor="nw")
+
+        self.bind_class("ResultList", "<MouseWheel>", lambda e: self.scroll_to(self.offset - e.delta // 120 * 3))
+        self.bind_class("ResultList", "<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.bind_class("ResultList", "<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self._add_wheel(self.body)
+
+    def _add_wheel(self, widget):
+        widget.bindtags(("ResultList",) + widget.bindtags())
+
+    def _resize(self, height):
+        """Grow the widget pool to cover the viewport (never shrinks)."""
+        needed = height // self.row_height + 1
+        while len(self.slots) < needed:
+            s = len(self.slots)
+            frame = tk.Frame(self.body, padx=5)
+            label = tk.Label(frame, anchor="w", font=("Segoe UI", 10))
+            dislike = tk.Button(frame, text="Dislike 👎", bg="#ffebee", font=("Segoe UI", 9),
+                                command=lambda s=s: self._clicked(s, self.on_dislike))
+            like = tk.Button(frame, text="Like 👍", bg="#e8f5e9", font=("Segoe UI", 9),
+                             command=lambda s=s: self._clicked(s, self.on_like))
+            dislike.pack(side="right", padx=2)
+            like.pack(side="right", padx=2)
+            label.pack(side="left", fill="x", expand=True)
+            for w in (frame, label, like, dislike):
+                self._add_wheel(w)
+            self.slots.append((frame, label))
+        self.scroll_to(self.offset)
+
+    def visible_rows(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def show_results(self, movie_ids, titles, genres, ratings, search_terms=None):
+        """Bind the list to new results; only the visible rows get drawn."""
+        self.message.place_forget()
+        self.movie_ids = np.asarray(movie_ids)
+        self.titles, self.genres, self.ratings = np.asarray(titles), np.asarray(genres), np.asarray(ratings)
+        self._clear_header()
+        if search_terms:
+            terms_text = f"Search terms: {', '.join(search_terms[:5])}"
+            if len(search_terms) > 5:
+                terms_text += f" and {len(search_terms) - 5} more..."
+            self.terms_label.config(text=terms_text)
+            self.terms_label.pack(fill="x", padx=5, pady=5)
+        self.count_label.config(text=f"Found {len(self.movie_ids)} movies:")
+        self.count_label.pack(fill="x", padx=10, pady=2)
+        self.scroll_to(0)
+
+    def show_text(self, text):
+        """Replace the results with a plain message."""
+        self.movie_ids = np.zeros(0, dtype=np.int64)
+        self._clear_header()
+        self.scroll_to(0)
+        self.message.config(text=text)
+        self.message.place(x=10, y=10)
+
+    def _clear_header(self):
+        self.terms_label.pack_forget()
+        self.count_label.pack_forget()
+
+    def scroll_to(self, offset):
+        n, visible = len(self.movie_ids), self.visible_rows()
+        self.offset = max(0, min(offset, n - visible))
+        for s in range(len(self.slots)):
+            self._draw(s)
+        if n:
+            self.scrollbar.set(self.offset / n, min(1.0, (self.offset + visible) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(round(float(amount) * len(self.movie_ids))))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(amount) * self.visible_rows())
+        else:
+            self.scroll_to(self.offset + int(amount))
+
+    def _draw(self, s):
+        frame, label = self.slots[s]
+        i = self.offset + s
+        if i >= len(self.movie_ids):
+            frame.place_forget()
+            return
+        color = ROW_COLORS[self.state_of(int(self.movie_ids[i]))] or self.body.cget("bg")
+        label.config(text=f"{self.titles[i]} | {self.genres[i]} |  {self.ratings[i]:.1f}", bg=color)
+        frame.config(bg=color)
+        frame.place(x=0, y=s * self.row_height, relwidth=1, height=self.row_height)
+
+    def _clicked(self, s, action):
+        i = self.offset + s
+        if i < len(self.movie_ids):
+            action(int(self.movie_ids[i]))
+            self.refresh_movie(int(self.movie_ids[i]))
+
+    def refresh_movie(self, movie_id):
+        """Redraw just the visible row showing movie_id, if any."""
+        for s in range(len(self.slots)):
+            i = self.offset + s
+            if i < len(self.movie_ids) and self.movie_ids[i] == movie_id:
+                self._draw(s)
+
+
+def benchmark(n_results=10000, steps=200):
+    """Time show_results and scrolling over n_results rows (needs a display)."""
+    root = tk.Tk()
+    root.geometry("1000x500")
+    view = ResultList(root, lambda m: None, lambda m: None, lambda m: None)
+    view.pack(fill="both", expand=True)
+    root.update()
+
+    ids = np.arange(n_results)
+    titles = np.array([f"Movie {i} (2000)" for i in ids])
+    genres = np.full(n_results, "Comedy|Drama")
+    start = time.perf_counter()
+    view.show_results(ids, titles, genres, np.linspace(0, 5, n_results))
+    root.update()
+    bind_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for step in range(steps):
+        view.scroll_to(step * n_results // steps)
+        root.update()
+    scroll_ms = (time.perf_counter() - start) / steps * 1000
+    widgets = len(view.slots)
+    print(f"{n_results:,} results: bind {bind_ms:.1f} ms, scroll {scroll_ms:.2f} ms/step, "
+          f"{widgets} row widgets")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:3]))
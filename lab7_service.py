@@ -0,0 +1,350 @@
+import asyncio
+import json
+import sys
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, quote, urlsplit
+
+import numpy as np
+
+from lab7_core import MOVIES_CSV, RATINGS_CSV, RecommenderCore
+
+MODES = ("content", "collaborative", "hybrid", "als")
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+class MicroBatcher:
+    """Collects concurrent requests with the same key and runs them as one call.
+
+    Batches run one at a time on the compute thread. While it is busy,
+    requests queue up per key; when it frees up, the oldest key's queue (up
+    to max_batch) goes to run(key, queries) as a single call. An idle
+    batcher waits window_ms after the first request so that a burst can
+    share one call. If the batched call raises, each query is rerun on its
+    own, so that one bad query fails only its own request.
+    """
+
+    def __init__(self, run, window_ms=2.0, max_batch=64, executor=None):
+        self.run = run
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._pending = OrderedDict()
+        self._busy = self._scheduled = False
+        self._tasks = set()  # running batches; the event loop only keeps weak references
+        self.batches = self.requests = 0
+
+    async def submit(self, key, query):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((query, future))
+        if not self._busy and not self._scheduled:
+            self._scheduled = True
+            loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        self._scheduled = False
+        if self._busy or not self._pending:
+            return
+        key, queue = next(iter(self._pending.items()))
+        batch, rest = queue[:self.max_batch], queue[self.max_batch:]
+        if rest:
+            self._pending[key] = rest
+            self._pending.move_to_end(key)
+        else:
+            del self._pending[key]
+        self._busy = True
+        self.batches += 1
+        self.requests += len(batch)
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _run_isolated(self, key, queries):
+        try:
+            return self.run(key, queries)
+        except Exception as e:
+            if len(queries) == 1:
+                return [e]
+        results = []
+        for query in queries:
+            try:
+                results.append(self.run(key, [query])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run(self, key, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self._run_isolated, key, [q for q, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            self._busy = False
+            if self._pending:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class RecommendationService:
+    """HTTP/1.1 JSON API over one shared RecommenderCore.
+
+    GET /search?q=toy story,matrix&genres=Comedy,Drama&limit=50
+    GET /recommend?mode=content&liked=1,2&disliked=3&k=20
+    GET /health
+    """
+
+    def __init__(self, core, window_ms=2.0, max_batch=64, cache_size=1024):
+        self.core = core
+        self.batcher = MicroBatcher(self._run_batch, window_ms, max_batch)
+        self.cache = LRUCache(cache_size) if cache_size else None
+
+    def _records(self, rows):
+        frame = self.core.movies.iloc[np.asarray(rows, dtype=np.int64)]
+        return json.dumps({"results": [
+            {"movieId": int(m), "title": t, "genres": g, "avg_rating": round(float(r), 3)}
+            for m, t, g, r in zip(frame["movieId"], frame["title"], frame["genres"], frame["avg_rating"])
+        ]}).encode()
+
+    def _run_batch(self, key, queries):
+        """Compute-thread side: one engine call per batch, then JSON bodies."""
+        if key[0] == "search":
+            return [self._records(rows) for rows in self.core.search_batch(queries, key[1])]
+        mode, k = key
+        return [self._records(rows) for rows in self.core.recommend_batch(mode, queries, k)]
+
+    @staticmethod
+    def _int_param(params, name, default):
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            value = 0
+        if value < 1:
+            raise HTTPError(400, f"{name} must be a positive integer")
+        return value
+
+    def _parse(self, target):
+        url = urlsplit(target)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        split = lambda name: [p.strip() for p in params.get(name, "").split(",") if p.strip()]
+        if url.path == "/search":
+            terms = [t.lower() for t in split("q")]
+            genres = split("genres")
+            if not terms and not genres:
+                raise HTTPError(400, "q or genres is required")
+            return ("search", self._int_param(params, "limit", 200)), (tuple(terms), tuple(genres))
+        if url.path == "/recommend":
+            mode = params.get("mode", "content")
+            if mode not in MODES:
+                raise HTTPError(400, f"mode must be one of {', '.join(MODES)}")
+            if mode == "als" and self.core.als_model is None:
+                raise HTTPError(503, "ALS model unavailable")
+            try:
+                liked = tuple(int(m) for m in split("liked"))
+                disliked = tuple(int(m) for m in split("disliked"))
+            except ValueError:
+                raise HTTPError(400, "liked and disliked must be comma-separated movieIds")
+            if not liked:
+                raise HTTPError(400, "liked is required")
+            return (mode, self._int_param(params, "k", 20)), (liked, disliked)
+        raise HTTPError(404, f"no route for {url.path}")
+
+    async def respond(self, target):
+        """(status, body) for a GET target."""
+        if urlsplit(target).path == "/health":
+            return 200, json.dumps({"ready": self.core.ready.is_set()}).encode()
+        if not self.core.ready.is_set():
+            raise HTTPError(503, "still loading")
+        key, query = self._parse(target)
+        cache_key = (key, query)
+        if self.cache is not None:
+            body = self.cache.get(cache_key)
+            if body is not None:
+                return 200, body
+        body = await self.batcher.submit(key, query)
+        if self.cache is not None:
+            self.cache.put(cache_key, body)
+        return 200, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+                try:
+                    if method != "GET":
+                        raise HTTPError(405, "only GET is supported")
+                    status, body = await self.respond(target)
+                except HTTPError as e:
+                    status, body = e.status, json.dumps({"error": str(e)}).encode()
+                except Exception:
+                    traceback.print_exc()
+                    status, body = 500, json.dumps({"error": "internal server error"}).encode()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                allow = "Allow: GET\r\n" if status == 405 else ""
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n{allow}"
+                             f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def _get(reader, writer, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def load_test(host, port, targets, concurrency=32):
+    """Send every target over concurrency keep-alive connections.
+
+    Returns (latencies in seconds, wall time, non-200 count).
+    """
+    queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        while not queue.empty():
+            target = queue.get_nowait()
+            start = time.perf_counter()
+            if await _get(reader, writer, target) != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start, errors
+
+
+def benchmark(movies_csv=MOVIES_CSV, ratings_csv=RATINGS_CSV, n_requests=2000, concurrency=32):
+    """p50/p99 latency and requests/s with and without batching and caching."""
+    core = RecommenderCore(movies_csv, ratings_csv).load()
+    rng = np.random.default_rng(0)
+    ids = core.movie_ids
+
+    def targets(n_distinct):
+        pool = []
+        for i in range(n_distinct):
+            liked = ",".join(map(str, rng.choice(ids, 5, replace=False)))
+            mode = ("content", "collaborative", "hybrid", "als")[i % 4]
+            pool.append(f"/recommend?mode={mode}&liked={liked}&k=20")
+            word = core.movies["title"].iloc[int(rng.integers(len(ids)))].split()[0]
+            pool.append(f"/search?q={quote(word)}&limit=50")
+        return [pool[i] for i in rng.integers(len(pool), size=n_requests)]
+
+    async def run(label, workload, **settings):
+        service = RecommendationService(core, **settings)
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        latencies, wall, errors = await load_test("127.0.0.1", port, workload, concurrency)
+        server.close()
+        await server.wait_closed()
+        ms = latencies * 1000
+        batches = service.batcher.batches
+        print(f"{label:30s} p50 {np.percentile(ms, 50):6.2f} ms  p99 {np.percentile(ms, 99):7.2f} ms  "
+              f"{len(latencies) / wall:7.0f} req/s  "
+              f"{service.batcher.requests / max(batches, 1):5.1f} req/batch  errors {errors}")
+
+    async def main():
+        print(f"{n_requests} requests, {concurrency} connections")
+        unique = targets(n_requests)
+        await run("no batching, no cache", unique, window_ms=0, max_batch=1, cache_size=0)
+        await run("micro-batching (2 ms)", unique, window_ms=2.0, cache_size=0)
+        await run("batching + LRU, repeats", targets(100), window_ms=2.0, cache_size=1024)
+
+    asyncio.run(main())
+
+
+def serve(port=8765, movies_csv=MOVIES_CSV, ratings_csv=RATINGS_CSV):
+    core = RecommenderCore(movies_csv, ratings_csv)
+    core.load_in_background()
+    service = RecommendationService(core)
+
+    async def main():
+        server = await service.serve(port=int(port))
+        print(f"Serving on http://127.0.0.1:{port} (loading models in the background)")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        benchmark(*sys.argv[2:4])
+    else:
+        serve(*sys.argv[1:4])
@@ -0,0 +1,166 @@
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE = Path(__file__).parent
+DB_PATH = BASE / "lab7_sessions.db"
+
+LIKE, DISLIKE = 1, -1
+
+
+class UserSession:
+    """One user's likes and dislikes, kept as insertion-ordered sets.
+
+    liked and disliked are dicts used as ordered sets (membership, add and
+    remove are O(1); iteration order is the order of the clicks, so the
+    most recent like is last). Changes are queued on the store and written
+    in batches.
+    """
+
+    def __init__(self, store, user, liked=(), disliked=()):
+        self.store = store
+        self.user = user
+        self.liked = dict.fromkeys(liked)
+        self.disliked = dict.fromkeys(disliked)
+
+    def like(self, movie_id):
+        self.disliked.pop(movie_id, None)
+        self.liked.setdefault(movie_id, None)
+        self.store.record(self.user, movie_id, LIKE)
+
+    def dislike(self, movie_id):
+        self.liked.pop(movie_id, None)
+        self.disliked.setdefault(movie_id, None)
+        self.store.record(self.user, movie_id, DISLIKE)
+
+    def state(self, movie_id):
+        if movie_id in self.liked:
+            return "liked"
+        if movie_id in self.disliked:
+            return "disliked"
+        return None
+
+    def snapshot(self):
+        """(liked, disliked) movieId tuples, safe to hand to another thread."""
+        return tuple(self.liked), tuple(self.disliked)
+
+
+class SessionStore:
+    """Per-user preferences in SQLite (WAL mode), with batched writes.
+
+    record() only queues a change; the queue is written in one transaction
+    when it reaches batch_size or when flush() is called (the UI flushes on
+    a timer and on exit). WAL lets other processes read while one writes,
+    and every row is keyed by (user, movie_id), so users never share state.
+    """
+
+    def __init__(self, path=DB_PATH, batch_size=64):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS preferences (
+                user TEXT NOT NULL,
+                movie_id INTEGER NOT NULL,
+                verdict INTEGER NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (user, movie_id)
+            ) WITHOUT ROWID""")
+        self._db.commit()
+        self._sessions = {}
+
+    def session(self, user):
+        """The UserSession for user, loaded from disk on first use."""
+        with self._lock:
+            if user not in self._sessions:
+                self._flush_locked()
+                rows = self._db.execute(
+                    "SELECT movie_id, verdict FROM preferences WHERE user = ? ORDER BY updated",
+                    (user,)).fetchall()
+                self._sessions[user] = UserSession(self, user,
+                                                   [m for m, v in rows if v == LIKE],
+                                                   [m for m, v in rows if v == DISLIKE])
+            return self._sessions[user]
+
+    def record(self, user, movie_id, verdict):
+        with self._lock:
+            # Only the latest verdict per (user, movie) needs writing;
+            # re-inserting keeps the queue in click order
+            self._pending.pop((user, movie_id), None)
+            self._pending[(user, movie_id)] = (verdict, time.time())
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows = [(user, mid, verdict, ts) for (user, mid), (verdict, ts) in self._pending.items()]
+        with self._db:
+            self._db.executemany("""
+                INSERT INTO preferences (user, movie_id, verdict, updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT (user, movie_id) DO UPDATE SET verdict = excluded.verdict,
+                                                          updated = excluded.updated""", rows)
+        self._pending.clear()
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+def benchmark(n_prefs=10000, n_users=20):
+    """List vs set like/dislike cost, batched vs per-click writes, and login load time."""
+    import random
+
+    rng = random.Random(0)
+    clicks = [(rng.randrange(60000), rng.random() < 0.7) for _ in range(n_prefs)]
+
+    start = time.perf_counter()
+    liked, disliked = [], []
+    for mid, like in clicks:
+        keep, drop = (liked, disliked) if like else (disliked, liked)
+        if mid not in keep:
+            keep.append(mid)
+        if mid in drop:
+            drop.remove(mid)
+    list_ms = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, batch_size in (("per-click commit", 1), ("batched (64)", 64)):
+            store = SessionStore(Path(tmp) / f"{batch_size}.db", batch_size=batch_size)
+            session = store.session("bench")
+            start = time.perf_counter()
+            for mid, like in clicks:
+                session.like(mid) if like else session.dislike(mid)
+            store.flush()
+            ms = (time.perf_counter() - start) * 1000
+            print(f"{n_prefs:,} clicks, sets + {label:17s} {ms:8.1f} ms")
+        print(f"{n_prefs:,} clicks, shared lists (no store)    {list_ms:8.1f} ms")
+
+        for u in range(n_users):
+            other = store.session(f"user{u}")
+            for mid, like in clicks[:n_prefs // n_users]:
+                other.like(mid) if like else other.dislike(mid)
+        store.close()
+
+        store = SessionStore(Path(tmp) / "64.db")
+        start = time.perf_counter()
+        session = store.session("bench")
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"login load: {len(session.liked) + len(session.disliked):,} prefs in {load_ms:.1f} ms "
+              f"(db holds {n_users + 1} users)")
+        store.close()
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:3]))
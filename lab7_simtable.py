@@ -0,0 +1,148 @@
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from lab7_ann import matrix_digest
+from lab7_itemcf import load_ratings, normalize_items, rating_matrix
+
+BASE = Path(__file__).parent
+TABLE_DIR = BASE / "simtable"
+
+
+def genre_tfidf(genres):
+    """The genre TF-IDF matrix lab7 uses for content similarity."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words="english").fit_transform(pd.Series(genres).fillna("").astype(str))
+
+
+def build_table(content, out_dir=TABLE_DIR, movie_ids=None, ratings=None, ratings_weight=0.5,
+                n_neighbors=50, block_size=256, n_jobs=4):
+    """Write the top-N similar rows of every movie to memory-mapped .npy files.
+
+    content is the (movies x features) genre TF-IDF; ratings, if given, is a
+    user x item rating matrix whose item cosine is blended in with
+    ratings_weight. Rows are processed in blocks by a thread pool (sparse
+    products release the GIL), each block writing its own slice, so only
+    block_size rows of the movie x movie similarity exist at a time.
+    meta.json records what the table was built from, for open_matching.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_items = content.shape[0]
+    n_neighbors = min(n_neighbors, n_items - 1)
+
+    content = sparse.csr_matrix(content, dtype=np.float32)
+    content_t = content.T.tocsc()
+    if ratings is not None:
+        by_user, by_item = normalize_items(ratings)
+
+    neighbors = np.lib.format.open_memmap(out_dir / "neighbors.npy", mode="w+", dtype=np.int32,
+                                          shape=(n_items, n_neighbors))
+    scores = np.lib.format.open_memmap(out_dir / "scores.npy", mode="w+", dtype=np.float32,
+                                       shape=(n_items, n_neighbors))
+
+    def run_block(start):
+        stop = min(start + block_size, n_items)
+        sims = (content[start:stop] @ content_t).toarray()
+        if ratings is not None:
+            cf = (by_item[start:stop] @ by_user).toarray()
+            sims = (1 - ratings_weight) * sims + ratings_weight * cf
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        top = np.argpartition(-sims, n_neighbors - 1, axis=1)[:, :n_neighbors]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.lexsort((top, -top_sims), axis=1)
+        neighbors[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_sims, order, axis=1)
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        list(pool.map(run_block, range(0, n_items, block_size)))
+    neighbors.flush()
+    scores.flush()
+    if movie_ids is not None:
+        np.save(out_dir / "movie_ids.npy", np.asarray(movie_ids, dtype=np.int64))
+    with open(out_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"content_digest": matrix_digest(content), "n_neighbors": n_neighbors,
+                   "backend": "content" if ratings is None else "content+ratings",
+                   "ratings_weight": None if ratings is None else ratings_weight}, f)
+
+
+class SimilarityTable:
+    """Read-only view of a table written by build_table; lookups are slices."""
+
+    def __init__(self, neighbors, scores, movie_ids, meta=None):
+        self.neighbors = neighbors
+        self.scores = scores
+        self.movie_ids = movie_ids
+        self.meta = meta or {}  # what build_table recorded; empty for tables built before meta.json
+        self.row_of = pd.Index(movie_ids)
+
+    @classmethod
+    def open(cls, table_dir=TABLE_DIR):
+        table_dir = Path(table_dir)
+        meta_path = table_dir / "meta.json"
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else None
+        return cls(np.load(table_dir / "neighbors.npy", mmap_mode="r"),
+                   np.load(table_dir / "scores.npy", mmap_mode="r"),
+                   np.load(table_dir / "movie_ids.npy"), meta)
+
+    @classmethod
+    def open_matching(cls, movie_ids, table_dir=TABLE_DIR, content=None, min_neighbors=None, backend=None):
+        """The table in table_dir if it was built for exactly these movies, else None.
+
+        With content, the table must also have been built from that feature
+        matrix (same matrix_digest); with min_neighbors, hold at least that
+        many neighbours per movie; with backend ("content" or
+        "content+ratings"), have been built that way.
+        """
+        try:
+            table = cls.open(table_dir)
+        except OSError:
+            return None
+        meta = table.meta
+        if not np.array_equal(table.movie_ids, movie_ids):
+            return None
+        if content is not None and meta.get("content_digest") != matrix_digest(content):
+            return None
+        if min_neighbors is not None and meta.get("n_neighbors", 0) < min_neighbors:
+            return None
+        if backend is not None and meta.get("backend") != backend:
+            return None
+        return table
+
+    def similar(self, movie_id, n=20):
+        """(rows, scores) of the n most similar movies to movie_id."""
+        row = self.row_of.get_loc(movie_id)
+        return np.asarray(self.neighbors[row, :n]), np.asarray(self.scores[row, :n])
+
+    def kneighbors_rows(self, rows, n_neighbors=25):
+        """(distances, indices) for seed rows, shaped like a kneighbors() result."""
+        rows = np.asarray(rows, dtype=np.int64)
+        n = min(n_neighbors, self.neighbors.shape[1])
+        return 1 - np.asarray(self.scores[rows, :n]), np.asarray(self.neighbors[rows, :n], dtype=np.int64)
+
+
+def main(movies_csv=BASE / "movies.csv", ratings_csv=None, n_jobs=4):
+    """Offline job: genre TF-IDF (plus optional ratings) -> TABLE_DIR."""
+    movies = pd.read_csv(movies_csv)
+    movie_ids = movies["movieId"].to_numpy()
+    content = genre_tfidf(movies["genres"])
+    ratings = None
+    if ratings_csv:
+        users, items, values = load_ratings(ratings_csv, movie_ids)
+        ratings = rating_matrix(users, items, values, len(movie_ids))
+
+    start = time.perf_counter()
+    build_table(content, TABLE_DIR, movie_ids, ratings, n_jobs=int(n_jobs))
+    print(f"Built top-N table for {len(movie_ids):,} movies in {time.perf_counter() - start:.1f}s "
+          f"({n_jobs} thread(s), ratings {'on' if ratings is not None else 'off'})")
+    print(f"Saved {TABLE_DIR}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
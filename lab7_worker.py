@@ -0,0 +1,175 @@
+import queue
+import sys
+import threading
+import time
+from itertools import count
+
+import numpy as np
+
+
+class Ticket:
+    """Handle for one submitted computation."""
+
+    def __init__(self, number, channel):
+        self.number = number
+        self.channel = channel
+        self.cancelled = False
+
+
+class ComputeExecutor:
+    """Runs computations on a background thread, latest request wins.
+
+    Each request belongs to a channel (e.g. "results"). Submitting a new
+    request cancels the older ones on that channel: if they have not
+    started they are skipped, and if they are running their result is
+    dropped. Results come back through a thread-safe queue that is drained
+    on the UI thread, either by poll() or, when a scheduler such as
+    root.after is given, by a repeating poll on the UI loop.
+    """
+
+    def __init__(self, schedule=None, poll_ms=15):
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._latest = {}
+        self._numbers = count(1)
+        self._lock = threading.Lock()
+        self._schedule = schedule
+        self._poll_ms = poll_ms
+        self.completed = self.skipped = self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="compute", daemon=True)
+        self._thread.start()
+        if schedule is not None:
+            schedule(poll_ms, self._pump)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, channel="default"):
+        with self._lock:
+            ticket = Ticket(next(self._numbers), channel)
+            previous = self._latest.get(channel)
+            if previous is not None:
+                previous.cancelled = True
+            self._latest[channel] = ticket
+        self._requests.put((ticket, fn, args, on_result, on_error))
+        return ticket
+
+    def cancel(self, channel="default"):
+        with self._lock:
+            ticket = self._latest.pop(channel, None)
+            if ticket is not None:
+                ticket.cancelled = True
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            ticket, fn, args, on_result, on_error = item
+            if ticket.cancelled:
+                self.skipped += 1
+                continue
+            try:
+                result, callback = fn(*args), on_result
+            except Exception as e:
+                result, callback = e, on_error
+            self._results.put((ticket, result, callback))
+
+    def poll(self):
+        """Deliver finished results on the calling (UI) thread; returns how many ran."""
+        delivered = 0
+        while True:
+            try:
+                ticket, result, callback = self._results.get_nowait()
+            except queue.Empty:
+                return delivered
+            if ticket.cancelled:
+                self.dropped += 1
+                continue
+            with self._lock:
+                if self._latest.get(ticket.channel) is ticket:
+                    del self._latest[ticket.channel]
+            self.completed += 1
+            if callback is not None:
+                callback(result)
+                delivered += 1
+
+    def _pump(self):
+        self.poll()
+        self._schedule(self._poll_ms, self._pump)
+
+    def wait_idle(self, timeout=10.0):
+        """Block until every submitted request has run (headless use)."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self._requests.empty() and not self._latest_pending():
+                return True
+            time.sleep(0.001)
+            self.poll()
+        return False
+
+    def _latest_pending(self):
+        with self._lock:
+            return any(not t.cancelled for t in self._latest.values())
+
+    def shutdown(self):
+        self._requests.put(None)
+        self._thread.join(timeout=1.0)
+
+
+def measure_ui_blocking(movies_csv="movies.csv", ratings_csv="ratings.csv", clicks=30, click_gap=0.005):
+    """Headless harness: UI-thread time per click, synchronous vs through the executor.
+
+    Drives the lab7 compute layer (search index, vectorized recommenders)
+    directly, with a burst of clicks to exercise cancellation.
+    """
+    import pandas as pd
+    from lab7_recs import exclusion_mask, genre_collaborative_rows, hybrid_rows
+    from lab7_search import TitleSearchIndex
+
+    movies = pd.read_csv(movies_csv)
+    ratings = pd.read_csv(ratings_csv, usecols=["movieId", "rating"])
+    movies["genres"] = movies["genres"].fillna("").astype(str)
+    movies["avg_rating"] = movies["movieId"].map(ratings.groupby("movieId")["rating"].mean()).fillna(0.0)
+    index = TitleSearchIndex.from_movies(movies)
+    movie_ids, avg = movies["movieId"].to_numpy(), movies["avg_rating"].to_numpy()
+    rng = np.random.default_rng(0)
+    liked_rows = rng.choice(len(movies), 5, replace=False)
+    terms = [" ".join(index.titles[i].split()[:2]) for i in rng.choice(len(movies), 50)]
+
+    def compute(mode):
+        if mode == 0:
+            return index.search(terms, [])[:200]
+        excluded = exclusion_mask(movie_ids, set(movie_ids[liked_rows]))
+        if mode == 1:
+            return genre_collaborative_rows(index.genre_matrix, avg, liked_rows, excluded)
+        return hybrid_rows(avg, liked_rows, excluded)
+
+    def render(rows):
+        # Stand-in for the UI work on results: slice the rows to display
+        movies.iloc[rows[:20]]
+
+    sync_block = []
+    for i in range(clicks):
+        start = time.perf_counter()
+        render(compute(i % 3))
+        sync_block.append(time.perf_counter() - start)
+
+    executor = ComputeExecutor()
+    async_block = []
+    for i in range(clicks):
+        start = time.perf_counter()
+        executor.submit(compute, i % 3, on_result=render, channel="results")
+        executor.poll()
+        async_block.append(time.perf_counter() - start)
+        time.sleep(click_gap)
+    executor.wait_idle()
+    executor.shutdown()
+
+    for name, blocks in (("synchronous", sync_block), ("executor", async_block)):
+        ms = np.array(blocks) * 1000
+        print(f"{name:12s} UI-thread block per click: mean {ms.mean():7.2f} ms  "
+              f"p99 {np.percentile(ms, 99):7.2f} ms  max {ms.max():7.2f} ms")
+    print(f"executor: {executor.completed} delivered, {executor.skipped} skipped, "
+          f"{executor.dropped} dropped as superseded")
+
+
+if __name__ == "__main__":
+    measure_ui_blocking(*sys.argv[1:3])
@@ -1,23 +1,64 @@
-import re
-import spacy
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-from collections import Counter
-from textblob import TextBlob
-from nltk.corpus import stopwords
-import nltk
-
-# Download NLTK stopwords if not already
-nltk.download('stopwords')
-stop_words = set(stopwords.words('english'))
-
-# Initialize spaCy model (make sure to install it first: python -m spacy download en_core_web_sm)
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Error: spaCy model 'en_core_web_sm' not found. Please install it with:")
-    print("python -m spacy download en_core_web_sm")
-    exit(1)
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from lab8_stats import CorpusStats
+from lab8_text import tokenize
+from lab8_cache import ArticleCache, CACHE_PATH
+from lab8_locations import Gazetteer, GAZETTEER_PATH
+from lab8_report import report_data, write_report, wordcloud_figure, locations_figure, top_words_figure
+
+# spaCy, TextBlob, NLTK and matplotlib are imported where they are first
+# used, so a run only pays for the libraries it needs (see --startup-times)
+BASE = Path(__file__).parent
+STOPWORDS_PATH = BASE / "lab8_stopwords.txt"
+REPORT_DIR = BASE / "lab8_report"
+
+# Only the entity recognizer is used, so the other components are not loaded
+# (in the sm pipeline ner has its own embedding layer, so tok2vec goes too)
+NER_MODEL = "en_core_web_sm"
+NER_UNUSED = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+_stop_words = None
+_nlp = None
+_lexicon_scorer = None
+
+def load_stop_words():
+    """NLTK's English stopwords, from a local copy made on the first run"""
+    global _stop_words
+    if _stop_words is None:
+        if not STOPWORDS_PATH.exists():
+            # Only this first run needs NLTK, and the download only if its corpus is missing
+            import nltk
+            from nltk.corpus import stopwords
+            try:
+                words = stopwords.words('english')
+            except LookupError:
+                nltk.download('stopwords')
+                words = stopwords.words('english')
+            STOPWORDS_PATH.write_text("\n".join(words), encoding="utf-8")
+        _stop_words = frozenset(STOPWORDS_PATH.read_text(encoding="utf-8").split())
+    return _stop_words
+
+def get_nlp():
+    """The NER pipeline, loaded on first use (make sure to install it first: python -m spacy download en_core_web_sm)"""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        try:
+            _nlp = spacy.load(NER_MODEL, exclude=NER_UNUSED)
+        except OSError:
+            print("Error: spaCy model 'en_core_web_sm' not found. Please install it with:")
+            print("python -m spacy download en_core_web_sm")
+            exit(1)
+    return _nlp
+
+def get_lexicon_scorer():
+    global _lexicon_scorer
+    if _lexicon_scorer is None:
+        from lab8_sentiment import LexiconSentiment
+        _lexicon_scorer = LexiconSentiment()
+    return _lexicon_scorer
 
 articles = [
     """
@@ -79,13 +120,11 @@ articles = [
 
 def clean_text(text):
     """Clean text by converting to lowercase and removing special characters"""
-    text = text.lower()
-    text = re.sub(r'[^a-z\s]', '', text)  # Keep only letters and spaces
-    text = re.sub(r'\s+', ' ', text)  # Remove extra whitespace
-    return text.strip()
+    return " ".join(tokenize(text))  # letters and single spaces only, see lab8_text.py
 
 def get_sentiment(text):
     """Analyze sentiment of text using TextBlob"""
+    from textblob import TextBlob
     analysis = TextBlob(text)
     polarity = analysis.sentiment.polarity
 
@@ -96,116 +135,285 @@ def get_sentiment(text):
     else:
         return "Neutral"
 
+def locations_from_doc(doc):
+    """Unique GPE (Geo-Political Entity) names in a processed spaCy doc"""
+    return list({ent.text for ent in doc.ents if ent.label_ == "GPE"})
+
 def extract_locations(text):
     """Extract location entities from text using spaCy"""
-    doc = nlp(text)
-    locations = []
-    for ent in doc.ents:
-        if ent.label_ == "GPE":  # GPE = Geo-Political Entity
-            locations.append(ent.text)
-    return list(set(locations))  # Remove duplicates
+    return locations_from_doc(get_nlp()(text))
 
-def main():
-    # Clean articles
-    cleaned_articles = [clean_text(a) for a in articles]
+def iter_articles(path=None):
+    """Yield articles one at a time from a feed file (blank-line separated),
+    or from the built-in sample when no file is given"""
+    if path is None:
+        yield from articles
+        return
+    with open(path, encoding="utf-8") as f:
+        lines = []
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            elif lines:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
 
-    # Analyze sentiments
-    sentiments = [get_sentiment(a) for a in cleaned_articles]
+# Bump when clean_text, get_sentiment or the location rules change, so cached
+# per-article results from older code are not reused
+RESULTS_VERSION = 2
 
-    # Extract all words for word cloud and bar chart
-    all_words = [w for w in " ".join(cleaned_articles).split() if w not in stop_words]
+def package_version(name):
+    """Installed version of a package from its metadata, without importing it ("unknown" if there is none)"""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
 
-    # Extract locations
-    locations = []
-    article_locations = []
+def pipeline_version(gazetteer=None, fallback=True, scorer=None):
+    """Everything that determines per-article results, for the cache key
 
-    for art in articles:
-        locs = extract_locations(art)
-        locations.extend(locs)
-        article_locations.append(locs)
+    Only the components this run can use are in it, so upgrading one it
+    does not use keeps the cache, and nothing is loaded to build it.
+    """
+    parts = []
+    if gazetteer is None or fallback:  # NER can run
+        parts += [f"{NER_MODEL}={package_version(NER_MODEL)}", f"exclude={','.join(NER_UNUSED)}",
+                  f"spacy={package_version('spacy')}"]
+    if scorer is None:
+        parts.append(f"textblob={package_version('textblob')}")
+    locator = "ner" if gazetteer is None else f"gazetteer:{gazetteer.version()}" + ("+ner" if fallback else "")
+    sentiment = "textblob" if scorer is None else f"lexicon:{scorer.version()}"
+    parts += [f"locations={locator}", f"sentiment={sentiment}", f"results={RESULTS_VERSION}"]
+    return ";".join(parts)
 
-    # Count location frequencies
-    location_counts = Counter(locations)
+def locate_stream(texts, batch_size=64, n_process=1, gazetteer=None, fallback=True):
+    """Yield (text, locations) for each article.
+
+    Without a gazetteer every article goes through NER. With one, places
+    come from a single gazetteer scan, and with fallback the articles it
+    finds nothing in still go through NER (a chunk at a time, so the
+    output stays in feed order).
+    """
+    if gazetteer is None:
+        for doc in get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield doc.text, locations_from_doc(doc)
+        return
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size * 16 * n_process))
+        if not chunk:
+            return
+        found = [gazetteer.find(t) for t in chunk]
+        if fallback:
+            misses = [i for i, locs in enumerate(found) if not locs]
+            docs = get_nlp().pipe([chunk[i] for i in misses], batch_size=batch_size, n_process=n_process)
+            for i, doc in zip(misses, docs):
+                found[i] = locations_from_doc(doc)
+        yield from zip(chunk, found)
+
+def analyze_batch(located, scorer=None):
+    """(text, tokens, sentiment, locations) for each (text, locations) pair;
+    a LexiconSentiment scorer labels the whole batch at once, otherwise
+    TextBlob scores each article"""
+    token_lists = [tokenize(text) for text, _ in located]
+    if scorer is None:
+        sentiments = [get_sentiment(" ".join(tokens)) for tokens in token_lists]
+    else:
+        sentiments = scorer.labels(token_lists)
+    return [(text, tokens, sentiment, locs)
+            for (text, locs), tokens, sentiment in zip(located, token_lists, sentiments)]
+
+def analyze_stream(texts, batch_size=64, n_process=1, cache=None, gazetteer=None, fallback=True, scorer=None):
+    """Yield (text, tokens, sentiment, locations) for each article.
+
+    texts can be any iterable, including a generator over a large feed;
+    NER runs in batches of batch_size through nlp.pipe, spread over
+    n_process worker processes. gazetteer and fallback choose how places
+    are found (see locate_stream), scorer how sentiment is scored (see
+    analyze_batch). With an ArticleCache, articles are looked up a chunk
+    at a time and only the ones not seen before are analyzed.
+    """
+    if cache is None:
+        located = locate_stream(texts, batch_size, n_process, gazetteer, fallback)
+        while True:
+            chunk = list(islice(located, batch_size * 16 * n_process))
+            if not chunk:
+                return
+            yield from analyze_batch(chunk, scorer)
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, batch_size * 16 * n_process))
+        if not chunk:
+            return
+        keys = [cache.key(t) for t in chunk]
+        results = cache.get_many(keys)
+        missing = [t for t, k in zip(chunk, keys) if k not in results]
+        located = list(locate_stream(missing, batch_size, n_process, gazetteer, fallback))
+        fresh = {cache.key(text): result for text, *result in analyze_batch(located, scorer)}
+        cache.put_many(fresh)
+        results.update(fresh)
+        for text, key in zip(chunk, keys):
+            tokens, sentiment, locs = results[key]
+            yield text, tokens, sentiment, locs
+
+def benchmark_cache(n_articles=5000, changed=0.1):
+    """Cold run, unchanged rerun and a rerun with some articles edited, through the cache"""
+    import tempfile
+    from pathlib import Path
+
+    feed = [f"{articles[i % len(articles)]} (report {i})" for i in range(n_articles)]
+    edited = [t + " Updated." if i % int(1 / changed) == 0 else t for i, t in enumerate(feed)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArticleCache(Path(tmp) / "cache.db", pipeline_version())
+        for label, texts in (("cold (empty cache)", feed), ("rerun, unchanged", feed),
+                             (f"rerun, {changed:.0%} edited", edited)):
+            hits, misses = cache.hits, cache.misses
+            start = time.perf_counter()
+            for _ in analyze_stream(texts, cache=cache):
+                pass
+            elapsed = time.perf_counter() - start
+            print(f"{label:22s} {n_articles / elapsed:8.0f} docs/s  "
+                  f"{cache.hits - hits} hits / {cache.misses - misses} misses")
+        start = time.perf_counter()
+        for _ in analyze_stream(feed):
+            pass
+        print(f"{'no cache':22s} {n_articles / (time.perf_counter() - start):8.0f} docs/s")
+        cache.close()
+
+def benchmark_locations(n_articles=5000, gazetteer_path=GAZETTEER_PATH):
+    """Documents per second and agreement with NER for each way of finding places"""
+    feed = [f"{articles[i % len(articles)]} (report {i})" for i in range(n_articles)]
+    gazetteer = Gazetteer.from_file(gazetteer_path)
+
+    sample = min(n_articles, 500)
+    start = time.perf_counter()
+    for text in feed[:sample]:
+        extract_locations(text)
+    print(f"{'nlp(text) per article':24s} {sample / (time.perf_counter() - start):8.0f} docs/s")
+
+    reference = None
+    for label, settings in (("nlp.pipe NER", {}), ("gazetteer", {"gazetteer": gazetteer, "fallback": False}),
+                            ("gazetteer + NER fallback", {"gazetteer": gazetteer})):
+        start = time.perf_counter()
+        found = [set(locs) for _, locs in locate_stream(feed, **settings)]
+        rate = n_articles / (time.perf_counter() - start)
+        if reference is None:
+            reference = found
+            print(f"{label:24s} {rate:8.0f} docs/s")
+            continue
+        same = sum(a == b for a, b in zip(found, reference))
+        hits = sum(len(a & b) for a, b in zip(found, reference))
+        precision = hits / max(sum(map(len, found)), 1)
+        recall = hits / max(sum(map(len, reference)), 1)
+        print(f"{label:24s} {rate:8.0f} docs/s  same places as NER in {same / n_articles:.0%} of articles, "
+              f"precision {precision:.2f}, recall {recall:.2f}")
+
+def benchmark_pipeline(n_articles=5000, process_counts=(1, 2, 4), batch_size=64):
+    """Documents per second: one nlp(text) call per article vs streamed nlp.pipe"""
+    def feed(n):
+        return (articles[i % len(articles)] for i in range(n))
+
+    import spacy
+    nlp = get_nlp()
+    full_nlp = spacy.load(NER_MODEL)
+    sample = min(n_articles, 500)
+    start = time.perf_counter()
+    for text in feed(sample):
+        locations_from_doc(full_nlp(text))
+    print(f"nlp(text) per article, full pipeline: {sample / (time.perf_counter() - start):8.0f} docs/s")
+
+    for n_process in process_counts:
+        start = time.perf_counter()
+        for doc in nlp.pipe(feed(n_articles), batch_size=batch_size, n_process=n_process):
+            locations_from_doc(doc)
+        rate = n_articles / (time.perf_counter() - start)
+        print(f"nlp.pipe NER only, n_process={n_process}:    {rate:8.0f} docs/s")
+
+def main(feed=None, stats_path=None, batch_size=64, n_process=1, sketch_size=None, cache_path=CACHE_PATH,
+         locator="ner", sentiment="textblob", report_dir=None, report_format="json"):
+    # Word, location and sentiment counts are updated as each article streams
+    # in; stats_path, if given, checkpoints them (see lab8_stats.py to merge)
+    stats = CorpusStats(load_stop_words(), sketch_size)
+    previews = []  # first few articles, for the printed results
 
-    # Map words to locations
-    location_word_map = {}
-    for i, locs in enumerate(article_locations):
-        words = cleaned_articles[i].split()
-        for loc in locs:
-            if loc not in location_word_map:
-                location_word_map[loc] = []
-            location_word_map[loc].extend(words)
+    # locator: "ner" (spaCy GPE entities), "gazetteer" (known place names from
+    # lab8_gazetteer.txt only) or "gazetteer+ner" (NER only where the
+    # gazetteer finds nothing)
+    if locator not in ("ner", "gazetteer", "gazetteer+ner"):
+        raise ValueError(f"unknown locator {locator!r}")
+    gazetteer = None if locator == "ner" else Gazetteer.from_file(GAZETTEER_PATH)
+    fallback = locator == "gazetteer+ner"
+
+    # sentiment: "textblob" (one TextBlob per article) or "lexicon" (the same
+    # lexicon and thresholds, scored in batches; see lab8_sentiment.py)
+    if sentiment not in ("textblob", "lexicon"):
+        raise ValueError(f"unknown sentiment scorer {sentiment!r}")
+    scorer = get_lexicon_scorer() if sentiment == "lexicon" else None
+    cache = ArticleCache(cache_path, pipeline_version(gazetteer, fallback, scorer)) if cache_path else None
+
+    # Clean, analyze sentiment and extract locations article by article;
+    # articles already in the cache skip NER and sentiment entirely
+    for text, tokens, label, locs in analyze_stream(iter_articles(feed), batch_size, n_process, cache,
+                                                    gazetteer, fallback, scorer):
+        stats.add(tokens, label, locs)
+        if len(previews) < 3:
+            previews.append((text, label))
+    if stats_path:
+        stats.save(stats_path)
+    if cache is not None:
+        print(f"Article cache: {cache.stats()}")
+        cache.close()
+
+    # Count location frequencies
+    location_counts = stats.locations
 
     # Get top words per location
-    top_words_per_location = {
-        loc: Counter(words).most_common(10)
-        for loc, words in location_word_map.items()
-    }
-
-    # 1. Generate and display Word Cloud
-    print("Generating Word Cloud...")
-    wc = WordCloud(
-        width=1000,
-        height=600,
-        background_color="white",
-        max_words=100,
-        colormap="viridis"
-    )
-    wc.generate(" ".join(cleaned_articles))
-
-    plt.figure(figsize=(12, 6))
-    plt.imshow(wc, interpolation="bilinear")
-    plt.axis("off")
-    plt.title("Environmental News Word Cloud (Philippines)", fontsize=18, pad=20)
-    plt.tight_layout()
-    plt.show()
-
-    # 2. Display location frequency bar chart
-    print("Generating Location Frequency Chart...")
-    if location_counts:
-        plt.figure(figsize=(10, 6))
-        locations_sorted = dict(sorted(location_counts.items(), key=lambda x: x[1], reverse=True))
-        plt.bar(locations_sorted.keys(), locations_sorted.values(), color='steelblue', edgecolor='black')
-        plt.xticks(rotation=45, ha='right', fontsize=10)
-        plt.yticks(fontsize=10)
-        plt.title("Most Mentioned Locations in Environmental Articles", fontsize=16, pad=20)
-        plt.xlabel("Location", fontsize=12)
-        plt.ylabel("Frequency", fontsize=12)
-        plt.grid(axis='y', alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        plt.show()
+    top_words_per_location = stats.top_words_per_location(10)
+
+    if report_dir:
+        # Headless: figures go to PNGs (rendered in parallel on the Agg
+        # backend) and the numbers to results.json / Parquet, all skipped
+        # when the counts are the same as last run's
+        if write_report(report_data(stats), report_dir, report_format):
+            print(f"Wrote report to {report_dir}")
+        else:
+            print(f"Counts unchanged since the last report in {report_dir}; skipped rendering")
     else:
-        print("No locations found for chart.")
-
-    # 3. Display most mentioned words bar chart
-    print("Generating Most Mentioned Words Chart...")
-    word_counts = Counter(all_words)
-    most_common_words = word_counts.most_common(15)  # Top 15 words
-    words, counts = zip(*most_common_words)
-
-    plt.figure(figsize=(12, 6))
-    plt.bar(words, counts, color='darkorange', edgecolor='black')
-    plt.xticks(rotation=45, ha='right', fontsize=10)
-    plt.yticks(fontsize=10)
-    plt.title("Top 15 Most Mentioned Words in Environmental Articles", fontsize=16, pad=20)
-    plt.xlabel("Word", fontsize=12)
-    plt.ylabel("Frequency", fontsize=12)
-    plt.grid(axis='y', alpha=0.3, linestyle='--')
-    plt.tight_layout()
-    plt.show()
+        import matplotlib.pyplot as plt
+
+        # 1. Generate and display Word Cloud
+        print("Generating Word Cloud...")
+        wordcloud_figure(dict(stats.words.most_common(1000)))
+        plt.show()
+
+        # 2. Display location frequency bar chart
+        print("Generating Location Frequency Chart...")
+        if location_counts:
+            locations_figure(location_counts)
+            plt.show()
+        else:
+            print("No locations found for chart.")
+
+        # 3. Display most mentioned words bar chart
+        print("Generating Most Mentioned Words Chart...")
+        top_words_figure(stats.words.most_common(15))  # Top 15 words
+        plt.show()
 
     # 4. Print text results
     print("\n" + "="*50)
     print("SENTIMENT ANALYSIS RESULTS")
     print("="*50)
-    for i, (sent, art) in enumerate(zip(sentiments, articles[:3]), 1):  # Show first 3 for brevity
+    for i, (art, sent) in enumerate(previews, 1):  # Show first 3 for brevity
         print(f"\nArticle {i}: {sent}")
         print(f"Preview: {art[:100]}...")
 
     print(f"\nSentiment Distribution:")
-    sentiment_dist = Counter(sentiments)
+    sentiment_dist = stats.sentiments
     for sent, count in sentiment_dist.items():
-        print(f" {sent}: {count} articles ({count/len(sentiments)*100:.1f}%)")
+        print(f" {sent}: {count} articles ({count/stats.articles*100:.1f}%)")
 
     print("\n" + "="*50)
     print("LOCATION ANALYSIS")
@@ -231,5 +439,135 @@ def main():
             for w, f in words[:5]:  # Show top 5 words per location
                 print(f" {w}: {f}")
 
+# A long-lived worker keeps the stopwords, spaCy model, TextBlob lexicon and
+# plotting libraries loaded, so jobs sent to it skip the startup cost
+WORKER_ADDRESS = ("localhost", 8766)
+# Jobs arrive pickled, so only clients holding this per-user key may connect
+WORKER_KEY_PATH = Path.home() / ".lab8_worker.key"
+
+def new_worker_key(path=WORKER_KEY_PATH):
+    """A fresh random key for this worker run, written where only this user can read it"""
+    import os
+    import secrets
+    key = secrets.token_bytes(32)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}")
+    # Created owner-only (0600) from the start, then swapped in, so the key is never readable by others
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    os.replace(tmp, path)
+    return key
+
+def read_worker_key(path=WORKER_KEY_PATH):
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        raise RuntimeError(f"no worker key at {path}; start a worker first with --worker") from None
+
+def serve_worker(address=WORKER_ADDRESS):
+    """Load everything once, then run jobs from submit_job one at a time.
+
+    Jobs run headless: report_dir defaults to REPORT_DIR. Each job's
+    printed output is sent back to the client.
+    """
+    import importlib
+    from contextlib import redirect_stdout
+    from io import StringIO
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Listener
+    import matplotlib
+    matplotlib.use("Agg")
+    # Imported up front so the report processes forked for each job inherit them
+    import matplotlib.pyplot
+    importlib.import_module("wordcloud")
+
+    load_stop_words()
+    get_nlp()
+    get_sentiment("warm up")
+    get_lexicon_scorer()
+    with Listener(address, authkey=new_worker_key()) as listener:
+        print(f"lab8 worker ready on {address[0]}:{address[1]}", flush=True)
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:  # a client without the key
+                continue
+            with conn:
+                job = conn.recv()
+                if job is None:  # stop_worker
+                    conn.send((True, "lab8 worker stopped\n"))
+                    return
+                args, options = job
+                options.setdefault("report_dir", REPORT_DIR)
+                output = StringIO()
+                try:
+                    with redirect_stdout(output):
+                        main(*args, **options)
+                    conn.send((True, output.getvalue()))
+                except Exception as e:
+                    conn.send((False, output.getvalue() + f"{type(e).__name__}: {e}\n"))
+
+def submit_job(args=(), options=None, address=WORKER_ADDRESS):
+    """Run main(*args, **options) on a running worker and print its output; None stops the worker"""
+    from multiprocessing.connection import Client
+    if args is not None:
+        # Paths are resolved here, since the worker may run in another directory
+        args = [str(Path(a).resolve()) for a in args]
+        options = dict(options or {})
+        if "report_dir" in options:
+            options["report_dir"] = str(Path(options["report_dir"]).resolve())
+    with Client(address, authkey=read_worker_key()) as conn:
+        conn.send(None if args is None else (args, options))
+        ok, output = conn.recv()
+    print(output, end="")
+    return ok
+
+def benchmark_startup(runs=3):
+    """Wall time of a small headless job: a fresh process each time (cold) vs sent to a worker (warm)"""
+    import subprocess
+    import tempfile
+
+    script = [sys.executable, str(Path(__file__).resolve())]
+
+    def timed(command):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, capture_output=True)
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job = [f"--report-dir={tmp}"]
+        cold = [timed(script + job) for _ in range(runs)]
+        worker = subprocess.Popen(script + ["--worker"], stdout=subprocess.PIPE, text=True)
+        start = time.perf_counter()
+        worker.stdout.readline()  # printed once the models are loaded
+        ready = time.perf_counter() - start
+        warm = [timed(script + ["--submit"] + job) for _ in range(runs)]
+        submit_job(None)
+        worker.wait()
+    print(f"cold start, new process per job: {' '.join(f'{t:.2f}s' for t in cold)}")
+    print(f"worker ready after:              {ready:.2f}s")
+    print(f"warm start, job sent to worker:  {' '.join(f'{t:.2f}s' for t in warm)}")
+
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["--benchmark"]:
+        benchmark_pipeline(*map(int, sys.argv[2:3]))
+    elif sys.argv[1:2] == ["--benchmark-cache"]:
+        benchmark_cache(*map(int, sys.argv[2:3]))
+    elif sys.argv[1:2] == ["--benchmark-locations"]:
+        benchmark_locations(*map(int, sys.argv[2:3]))
+    elif sys.argv[1:2] == ["--startup-times"]:
+        benchmark_startup(*map(int, sys.argv[2:3]))
+    elif sys.argv[1:2] == ["--worker"]:
+        serve_worker()
+    elif sys.argv[1:2] == ["--stop-worker"]:
+        submit_job(None)
+    else:
+        # --locator=..., --sentiment=..., --report-dir=... and --report-format=... pass through to main;
+        # with --submit the job runs on a --worker instead of in this process
+        args = [a for a in sys.argv[1:] if not a.startswith("--")]
+        options = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+        options = {k.replace("-", "_"): v for k, v in options.items()
+                   if k in ("locator", "sentiment", "report-dir", "report-format")}
+        if "--submit" in sys.argv[1:]:
+            sys.exit(0 if submit_job(args[:2], options) else 1)
+        main(*args[:2], **options)
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+BASE = Path(__file__).parent
+CACHE_PATH = BASE / "lab8_cache.db"
+
+
+class ArticleCache:
+    """Per-article NLP results in SQLite, keyed by a hash of text + pipeline version.
+
+    version should name everything that affects the results (model name and
+    version, library versions, cleaning rules); changing it makes every old
+    entry a miss, and those then age out. Entries are evicted least recently
+    used first once the stored values exceed max_bytes. hits, misses and
+    evictions count this instance's activity.
+    """
+
+    def __init__(self, path=CACHE_PATH, version="", max_bytes=256 * 2**20):
+        self.path = Path(path)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key BLOB PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            ) WITHOUT ROWID""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def key(self, text):
+        digest = hashlib.blake2b(self.version.encode(), digest_size=16)
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _select_in(self, columns, keys):
+        """Rows of columns for the given keys, queried in blocks of 500."""
+        for start in range(0, len(keys), 500):
+            block = keys[start:start + 500]
+            yield from self._db.execute(
+                f"SELECT {columns} FROM results WHERE key IN ({','.join('?' * len(block))})", block)
+
+    def get_many(self, keys):
+        """{key: value} for the keys that are cached; marks them recently used."""
+        keys = list(dict.fromkeys(keys))
+        found = {k: json.loads(v) for k, v in self._select_in("key, value", keys)}
+        if found:
+            now = time.time()
+            with self._db:
+                self._db.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                     [(now, k) for k in found])
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store {key: value} (JSON-serializable values), then evict down to max_bytes."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(k, json.dumps(v)) for k, v in items.items()]
+        replaced = sum(size for (size,) in self._select_in("size", [k for k, _ in rows]))
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                 [(k, v, len(v), now) for k, v in rows])
+        self.total_bytes += sum(len(v) for _, v in rows) - replaced
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        target = self.max_bytes * 0.9  # leave headroom so eviction is not triggered on every put
+        victims, freed = [], 0
+        cursor = self._db.execute("SELECT key, size FROM results ORDER BY last_used")
+        while self.total_bytes - freed > target:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for key, size in rows:
+                if self.total_bytes - freed <= target:
+                    break
+                victims.append((key,))
+                freed += size
+        cursor.close()
+        with self._db:
+            self._db.executemany("DELETE FROM results WHERE key = ?", victims)
+        self.total_bytes -= freed
+        self.evictions += len(victims)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return (f"{self.hits} hits, {self.misses} misses ({self.hits / total:.0%} hit rate), "
+                f"{self.evictions} evicted, {self.total_bytes / 2**20:.1f} MiB stored" if total else "unused")
+
+    def close(self):
+        self._db.close()
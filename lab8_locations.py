@@ -0,0 +1,74 @@
+import hashlib
+import re
+from pathlib import Path
+
+BASE = Path(__file__).parent
+GAZETTEER_PATH = BASE / "lab8_gazetteer.txt"
+_WORD = re.compile(r"\w+")
+
+
+class Gazetteer:
+    """Known place names, matched in one left-to-right scan over the words of a text.
+
+    Names are kept in a trie keyed by word. At each word the longest name
+    starting there is taken and the scan resumes after it, so "Cebu City"
+    wins over "Cebu" and each word is looked at no more than the length of
+    the longest name (a few words): the scan is linear in the text.
+    Matching is case sensitive, like the capitalized names NER picks up,
+    and punctuation between words is ignored ("Talon-Talon"). Names are
+    returned as written in the text, the same as ent.text.
+    """
+
+    def __init__(self, names=()):
+        self._root = {}
+        self.names = []
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_file(cls, path=GAZETTEER_PATH):
+        """One place name per line; blank lines and # comments are skipped."""
+        with open(path, encoding="utf-8") as f:
+            return cls(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+
+    def add(self, name):
+        words = _WORD.findall(name)
+        if not words:
+            return
+        node = self._root
+        for word in words:
+            node = node.setdefault(word, {})
+        if None not in node:
+            node[None] = True  # a name ends here
+            self.names.append(name)
+
+    def version(self):
+        """Short digest of the names, for cache keys."""
+        return hashlib.blake2b("\n".join(sorted(self.names)).encode(), digest_size=8).hexdigest()
+
+    def find(self, text):
+        """Unique place names in text, in order of first appearance."""
+        root = self._root
+        words = list(_WORD.finditer(text))
+        found = {}
+        i, n = 0, len(words)
+        while i < n:
+            node = root.get(words[i].group())
+            if node is None:
+                i += 1
+                continue
+            end = i if None in node else None
+            j = i + 1
+            while j < n:
+                node = node.get(words[j].group())
+                if node is None:
+                    break
+                if None in node:
+                    end = j
+                j += 1
+            if end is None:
+                i += 1
+            else:
+                found[text[words[i].start():words[end].end()]] = None
+                i = end + 1
+        return list(found)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Plotting libraries are imported inside the figure functions, so that
+# workers can pick the Agg backend before pyplot loads
+
+
+def report_data(stats, cloud_words=1000, words_per_location=10):
+    """The numbers behind the lab8 report, as JSON-ready data."""
+    return {
+        "articles": stats.articles,
+        "sentiments": dict(stats.sentiments.most_common()),
+        "locations": dict(stats.locations.most_common()),
+        "top_words": [[w, c] for w, c in stats.words.most_common(cloud_words)],
+        "top_words_per_location": {loc: [[w, c] for w, c in words]
+                                   for loc, words in stats.top_words_per_location(words_per_location).items()},
+    }
+
+
+def fingerprint(data):
+    return hashlib.blake2b(json.dumps(data, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def wordcloud_figure(frequencies):
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+
+    wc = WordCloud(
+        width=1000,
+        height=600,
+        background_color="white",
+        max_words=100,
+        colormap="viridis"
+    )
+    wc.generate_from_frequencies(frequencies)
+
+    fig = plt.figure(figsize=(12, 6))
+    plt.imshow(wc, interpolation="bilinear")
+    plt.axis("off")
+    plt.title("Environmental News Word Cloud (Philippines)", fontsize=18, pad=20)
+    plt.tight_layout()
+    return fig
+
+
+def locations_figure(location_counts):
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(10, 6))
+    locations_sorted = dict(sorted(location_counts.items(), key=lambda x: x[1], reverse=True))
+    plt.bar(locations_sorted.keys(), locations_sorted.values(), color='steelblue', edgecolor='black')
+    plt.xticks(rotation=45, ha='right', fontsize=10)
+    plt.yticks(fontsize=10)
+    plt.title("Most Mentioned Locations in Environmental Articles", fontsize=16, pad=20)
+    plt.xlabel("Location", fontsize=12)
+    plt.ylabel("Frequency", fontsize=12)
+    plt.grid(axis='y', alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    return fig
+
+
+def top_words_figure(most_common_words):
+    import matplotlib.pyplot as plt
+
+    words, counts = zip(*most_common_words)
+    fig = plt.figure(figsize=(12, 6))
+    plt.bar(words, counts, color='darkorange', edgecolor='black')
+    plt.xticks(rotation=45, ha='right', fontsize=10)
+    plt.yticks(fontsize=10)
+    plt.title("Top 15 Most Mentioned Words in Environmental Articles", fontsize=16, pad=20)
+    plt.xlabel("Word", fontsize=12)
+    plt.ylabel("Frequency", fontsize=12)
+    plt.grid(axis='y', alpha=0.3, linestyle='--')
+    plt.tight_layout()
+    return fig
+
+
+def _figures(data):
+    """{name: (figure function, argument)} for the figures this data can draw."""
+    figures = {}
+    if data["top_words"]:
+        figures["wordcloud"] = (wordcloud_figure, dict(data["top_words"]))
+        figures["top_words"] = (top_words_figure, data["top_words"][:15])
+    if data["locations"]:
+        figures["locations"] = (locations_figure, data["locations"])
+    return figures
+
+
+def _render(draw, argument, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig = draw(argument)
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+RESULT_FILES = {
+    "json": ("results.json",),
+    "parquet": ("sentiments.parquet", "locations.parquet", "top_words.parquet", "top_words_per_location.parquet"),
+}
+
+
+def write_results(data, out_dir, fmt="json"):
+    """results.json, or one Parquet table per result (needs pandas with pyarrow or fastparquet)."""
+    out_dir = Path(out_dir)
+    if fmt == "json":
+        with open(out_dir / "results.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        return
+    if fmt != "parquet":
+        raise ValueError(f"unknown results format {fmt!r}")
+    import pandas as pd
+
+    pd.DataFrame(list(data["sentiments"].items()), columns=["sentiment", "articles"]).to_parquet(
+        out_dir / "sentiments.parquet", index=False)
+    pd.DataFrame(list(data["locations"].items()), columns=["location", "mentions"]).to_parquet(
+        out_dir / "locations.parquet", index=False)
+    pd.DataFrame(data["top_words"], columns=["word", "count"]).to_parquet(out_dir / "top_words.parquet", index=False)
+    pd.DataFrame([(loc, w, c) for loc, words in data["top_words_per_location"].items() for w, c in words],
+                 columns=["location", "word", "count"]).to_parquet(out_dir / "top_words_per_location.parquet",
+                                                                   index=False)
+
+
+def write_report(data, out_dir, fmt="json", workers=3, force=False):
+    """Write the results and render the figures to PNGs in out_dir, headless.
+
+    Figures render in parallel worker processes on the Agg backend. A
+    fingerprint of data is stored next to them; if it matches and the
+    figures and result files are all there, nothing is written and False
+    is returned.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = out_dir / f"report.{fmt}.fingerprint"
+    current = fingerprint(data)
+    figures = _figures(data)
+    paths = {name: out_dir / f"{name}.png" for name in figures}
+    outputs = list(paths.values()) + [out_dir / name for name in RESULT_FILES.get(fmt, ())]
+    if not force and stamp.exists() and stamp.read_text() == current and all(p.exists() for p in outputs):
+        return False
+
+    stamp.unlink(missing_ok=True)
+    write_results(data, out_dir, fmt)
+    jobs = [(draw, argument, paths[name]) for name, (draw, argument) in figures.items()]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            list(pool.map(_render, *zip(*jobs)))
+    else:
+        for job in jobs:
+            _render(*job)
+    stamp.write_text(current)
+    return True
+
+
+def benchmark(n_words=5000, n_locations=40, seed=0):
+    """Seconds per report: figures one after another, in parallel, and an unchanged rerun."""
+    import tempfile
+    from collections import Counter
+
+    import numpy as np
+
+    from lab8_stats import CorpusStats
+
+    rng = np.random.default_rng(seed)
+    stats = CorpusStats()
+    stats.articles = 10000
+    stats.sentiments = Counter({"Positive": 4000, "Neutral": 3500, "Negative": 2500})
+    stats.locations = Counter({f"Place {i}": int(c) for i, c in enumerate(rng.zipf(1.5, n_locations))})
+    stats.words = Counter({f"word{i}": int(c) for i, c in enumerate(rng.zipf(1.3, n_words))})
+    stats.location_words = {loc: Counter(dict(stats.words.most_common(50))) for loc in stats.locations}
+    data = report_data(stats)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, workers, force in (("sequential (1 process)", 1, True), ("parallel (3 processes)", 3, True),
+                                      ("rerun, counts unchanged", 3, False)):
+            start = time.perf_counter()
+            rendered = write_report(data, tmp, workers=workers, force=force)
+            print(f"{label:26s} {time.perf_counter() - start:6.2f}s  {'rendered' if rendered else 'skipped'}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
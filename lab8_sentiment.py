@@ -0,0 +1,145 @@
+import hashlib
+import sys
+import time
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+
+# Same cut-offs as get_sentiment in lab8
+POSITIVE_ABOVE = 0.1
+NEGATIVE_BELOW = -0.1
+
+_UNKNOWN, _NEGATION, _SHORT = -1, -2, -3
+
+
+class LexiconSentiment:
+    """TextBlob-style polarity for many documents at once.
+
+    TextBlob's lexicon is compiled once into a word -> column index plus a
+    score array. polarity() then takes a batch of token lists and builds
+    one sparse document-term matrix over 2 * len(vocabulary) columns: one
+    column per lexicon word and one per negated occurrence of it. Negated
+    means "no", "not" or "never" right before the word, or with one
+    one-letter word between ("not a good"). Negated columns score
+    -0.5 * polarity, as TextBlob does. A document's polarity is the matrix
+    times the scores, divided by the number of lexicon words in the
+    document.
+
+    TextBlob also folds an adverb into the next lexicon word ("very good"
+    is one assessment scoring 0.7 * 1.3). Those adjacent pairs are
+    corrected for after the matrix product. Longer adverb chains and
+    modifiers across gaps are not, so polarities can differ slightly from
+    TextBlob's. benchmark() measures how often the labels agree.
+    """
+
+    def __init__(self, lexicon=None):
+        if lexicon is None:
+            from textblob.en import sentiment as lexicon
+            lexicon.load()
+        words = sorted(w for w in lexicon if w.isalpha() and w.islower())
+        self.vocabulary = {w: i for i, w in enumerate(words)}
+        self.polarity_of = np.array([lexicon[w][None][0] for w in words])
+        self.intensity_of = np.array([lexicon[w][None][2] for w in words])
+        self.is_modifier = np.array(["RB" in lexicon[w] for w in words])
+        self.weights = np.concatenate([self.polarity_of, -0.5 * self.polarity_of])
+        self._codes = dict(self.vocabulary)
+        for word in ("no", "not", "never"):
+            self._codes.setdefault(word, _NEGATION)
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            self._codes.setdefault(letter, _SHORT)
+
+    def version(self):
+        """Short digest of the compiled lexicon, for cache keys."""
+        digest = hashlib.blake2b("\n".join(self.vocabulary).encode(), digest_size=8)
+        for array in (self.polarity_of, self.intensity_of, self.is_modifier):
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def document_term_matrix(self, docs):
+        """(csr matrix, token codes, token doc ids) for a batch of token lists."""
+        lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+        total = int(lengths.sum())
+        codes = np.fromiter(map(self._codes.get, chain.from_iterable(docs), [_UNKNOWN] * total),
+                            dtype=np.int64, count=total)
+        doc_of = np.repeat(np.arange(len(docs)), lengths)
+
+        same_doc = np.zeros(total, dtype=bool)
+        same_doc[1:] = doc_of[1:] == doc_of[:-1]
+        after_negation = np.zeros(total, dtype=bool)
+        after_negation[1:] = (codes[:-1] == _NEGATION) & same_doc[1:]
+        after_negation[2:] |= (codes[1:-1] == _SHORT) & (codes[:-2] == _NEGATION) & same_doc[2:] & same_doc[1:-1]
+
+        known = codes >= 0
+        columns = codes[known] + len(self.vocabulary) * after_negation[known]
+        matrix = sparse.csr_matrix((np.ones(len(columns)), (doc_of[known], columns)),
+                                   shape=(len(docs), len(self.weights)))
+        return matrix, codes, doc_of
+
+    def polarity(self, docs):
+        """Polarity in [-1, 1] of each token list in docs (0.0 if it has no lexicon words)."""
+        matrix, codes, doc_of = self.document_term_matrix(docs)
+        sums = matrix @ self.weights
+        counts = np.asarray(matrix.sum(axis=1)).ravel()
+
+        # "very good": the adverb and the word it modifies are one assessment
+        first, second = codes[:-1], codes[1:]
+        pairs = np.flatnonzero((first >= 0) & (second >= 0) & (doc_of[:-1] == doc_of[1:]))
+        pairs = pairs[self.is_modifier[codes[pairs]]]
+        if len(pairs):
+            mod, word = codes[pairs], codes[pairs + 1]
+            negated = (pairs > 0) & (codes[pairs - 1] == _NEGATION)  # "not very good"
+            intensity = np.where(negated, 1 / self.intensity_of[mod], self.intensity_of[mod])
+            combined = np.clip(self.polarity_of[word] * intensity, -1.0, 1.0) * np.where(negated, -0.5, 1.0)
+            separate = self.weights[mod + len(self.vocabulary) * negated] + self.polarity_of[word]
+            sums += np.bincount(doc_of[pairs], combined - separate, minlength=len(docs))
+            counts -= np.bincount(doc_of[pairs], minlength=len(docs))
+        return np.divide(sums, counts, out=np.zeros(len(docs)), where=counts > 0)
+
+    def labels(self, docs):
+        """"Positive", "Negative" or "Neutral" for each token list, with get_sentiment's thresholds."""
+        scores = self.polarity(docs)
+        return np.where(scores > POSITIVE_ABOVE, "Positive",
+                        np.where(scores < NEGATIVE_BELOW, "Negative", "Neutral")).tolist()
+
+
+def benchmark(n_docs=20000, words_per_doc=120, seed=0):
+    """Docs/s and label agreement: TextBlob per document vs LexiconSentiment batches."""
+    from textblob import TextBlob
+
+    rng = np.random.default_rng(seed)
+    scorer = LexiconSentiment()
+    lexicon_words = np.array(list(scorer.vocabulary))
+    filler = np.array("the of and a in to city river air water officials residents said report program "
+                      "local government plastic waste area environmental groups after from with".split())
+    docs = []
+    for _ in range(n_docs):
+        words = rng.choice(filler, words_per_doc).tolist()
+        for at in rng.choice(words_per_doc, 6, replace=False):
+            words[at] = str(rng.choice(lexicon_words))
+        for at in rng.choice(words_per_doc - 1, 2, replace=False):
+            words[at] = str(rng.choice(["not", "very", "really", "no", "never"]))
+        docs.append(words)
+
+    sample = min(n_docs, 2000)
+    start = time.perf_counter()
+    reference = [TextBlob(" ".join(d)).sentiment.polarity for d in docs[:sample]]
+    textblob_rate = sample / (time.perf_counter() - start)
+    print(f"{'TextBlob per document':28s} {textblob_rate:9.0f} docs/s")
+
+    for batch_size in (64, 1024):
+        start = time.perf_counter()
+        scores = np.concatenate([scorer.polarity(docs[i:i + batch_size]) for i in range(0, n_docs, batch_size)])
+        rate = n_docs / (time.perf_counter() - start)
+        print(f"{f'LexiconSentiment, batch {batch_size}':28s} {rate:9.0f} docs/s  ({rate / textblob_rate:.0f}x)")
+
+    reference = np.array(reference)
+    ours = scores[:sample]
+    label = lambda p: np.where(p > POSITIVE_ABOVE, 1, np.where(p < NEGATIVE_BELOW, -1, 0))
+    print(f"label agreement {np.mean(label(ours) == label(reference)):.1%}, "
+          f"polarity within 0.01 {np.mean(np.abs(ours - reference) < 0.01):.1%}, "
+          f"mean abs difference {np.mean(np.abs(ours - reference)):.4f}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:2]))
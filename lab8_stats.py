@@ -0,0 +1,223 @@
+import heapq
+import json
+import sys
+from collections import Counter
+
+from lab8_text import content_words
+
+
+class SpaceSaving:
+    """Bounded-memory heavy-hitter counts (Space-Saving, with batched pruning).
+
+    Keeps at most 2 * capacity counters. When that fills up, only the
+    capacity largest survive and the largest evicted count becomes the
+    floor: a word seen again later starts from the floor, so every count
+    over-estimates the true one by at most floor. Any word whose true count
+    is above floor is guaranteed to still be tracked.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.floor = 0
+
+    def update(self, items):
+        counts = self.counts
+        for item, n in Counter(items).items():
+            counts[item] = counts.get(item, self.floor) + n
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self):
+        keep = heapq.nlargest(self.capacity, self.counts.items(), key=lambda kv: kv[1])
+        kept = dict(keep)
+        self.floor = max(self.floor, max((c for w, c in self.counts.items() if w not in kept), default=0))
+        self.counts = kept
+
+    def merge(self, other):
+        """Add another sketch's counts (e.g. from another worker) into this one."""
+        merged = {w: c + other.counts.get(w, other.floor) for w, c in self.counts.items()}
+        for w, c in other.counts.items():
+            if w not in merged:
+                merged[w] = c + self.floor
+        self.counts = merged
+        self.floor += other.floor
+        if len(self.counts) > 2 * self.capacity:
+            self._prune()
+        return self
+
+    def most_common(self, n=None):
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return items if n is None else items[:n]
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "floor": self.floor, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["capacity"])
+        sketch.floor = data["floor"]
+        sketch.counts = dict(data["counts"])
+        return sketch
+
+
+def _new_counter(sketch_size):
+    return SpaceSaving(sketch_size) if sketch_size else Counter()
+
+
+def _merge_counter(mine, theirs):
+    if isinstance(mine, SpaceSaving):
+        return mine.merge(theirs)
+    mine.update(theirs)
+    return mine
+
+
+def _counter_to_json(counter):
+    if isinstance(counter, SpaceSaving):
+        return counter.to_dict()
+    return {"counts": dict(counter)}
+
+
+def _counter_from_json(data):
+    if "capacity" in data:
+        return SpaceSaving.from_dict(data)
+    return Counter(data["counts"])
+
+
+class CorpusStats:
+    """Running word, location and sentiment counts for a stream of articles.
+
+    add() updates the counters one article at a time, so memory depends on
+    the vocabulary, not on the number of articles. Stats built separately
+    (other processes, other feed shards) combine with merge(), and
+    save()/load() checkpoint them as JSON. With sketch_size set, the global
+    and per-location word counts are SpaceSaving sketches capped at about
+    2 * sketch_size words each instead of exact Counters.
+    """
+
+    def __init__(self, stop_words=frozenset(), sketch_size=None):
+        self.stop_words = frozenset(stop_words)
+        self.sketch_size = sketch_size
+        self.articles = 0
+        self.sentiments = Counter()
+        self.locations = Counter()
+        self.words = _new_counter(sketch_size)  # stopwords removed
+        self.location_words = {}  # location -> counts of all words in its articles
+
+    def add(self, words, sentiment, locations):
+        """Count one article: its word list, sentiment label and unique locations."""
+        self.articles += 1
+        self.sentiments[sentiment] += 1
+        self.locations.update(locations)
+        self.words.update(content_words(words, self.stop_words))
+        for loc in locations:
+            if loc not in self.location_words:
+                self.location_words[loc] = _new_counter(self.sketch_size)
+            self.location_words[loc].update(words)
+
+    def merge(self, other):
+        if self.sketch_size != other.sketch_size:
+            describe = lambda size: f"sketch_size={size}" if size else "exact counts"
+            raise ValueError(f"cannot merge stats with {describe(other.sketch_size)} into stats with "
+                             f"{describe(self.sketch_size)}; build both with the same sketch_size")
+        self.articles += other.articles
+        self.sentiments.update(other.sentiments)
+        self.locations.update(other.locations)
+        _merge_counter(self.words, other.words)
+        for loc, counts in other.location_words.items():
+            if loc in self.location_words:
+                _merge_counter(self.location_words[loc], counts)
+            else:
+                self.location_words[loc] = counts
+        return self
+
+    def top_words_per_location(self, n=10):
+        return {loc: counts.most_common(n) for loc, counts in self.location_words.items()}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "sketch_size": self.sketch_size,
+                "stop_words": sorted(self.stop_words),
+                "articles": self.articles,
+                "sentiments": self.sentiments,
+                "locations": self.locations,
+                "words": _counter_to_json(self.words),
+                "location_words": {loc: _counter_to_json(c) for loc, c in self.location_words.items()},
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        stats = cls(data["stop_words"], data["sketch_size"])
+        stats.articles = data["articles"]
+        stats.sentiments = Counter(data["sentiments"])
+        stats.locations = Counter(data["locations"])
+        stats.words = _counter_from_json(data["words"])
+        stats.location_words = {loc: _counter_from_json(c) for loc, c in data["location_words"].items()}
+        return stats
+
+
+def merge_files(out_path, *paths):
+    """Merge checkpoints written by separate runs (e.g. one per feed shard)."""
+    stats = CorpusStats.load(paths[0])
+    for path in paths[1:]:
+        stats.merge(CorpusStats.load(path))
+    stats.save(out_path)
+    print(f"Merged {len(paths)} checkpoints ({stats.articles:,} articles) into {out_path}")
+
+
+def benchmark(n_articles=50000, vocab=50000, words_per_article=300, sketch_size=2000, seed=0):
+    """Exact Counters vs Space-Saving on a Zipf-distributed synthetic stream."""
+    import time
+    import tracemalloc
+
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    words = np.array([f"w{i}" for i in range(vocab)])
+    places = [f"place{i}" for i in range(50)]
+    articles = []
+    for _ in range(min(n_articles, 2000)):
+        ids = np.minimum(rng.zipf(1.2, words_per_article), vocab) - 1
+        articles.append((words[ids].tolist(), list(rng.choice(places, 2, replace=False))))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    all_words, location_word_map = [], {}
+    for i in range(n_articles):
+        tokens, locs = articles[i % len(articles)]
+        all_words.extend(tokens)
+        for loc in locs:
+            location_word_map.setdefault(loc, []).extend(tokens)
+    Counter(all_words).most_common(50)
+    {loc: Counter(words).most_common(10) for loc, words in location_word_map.items()}
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del all_words, location_word_map
+    print(f"{'word lists + Counter':22s} {n_articles / elapsed:8.0f} articles/s  peak {peak / 2**20:7.1f} MiB")
+
+    results = {}
+    for label, size in (("exact Counter", None), (f"Space-Saving ({sketch_size})", sketch_size)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        stats = CorpusStats(sketch_size=size)
+        for i in range(n_articles):
+            tokens, locs = articles[i % len(articles)]
+            stats.add(tokens, "Neutral", locs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = [w for w, _ in stats.words.most_common(50)]
+        print(f"{label:22s} {n_articles / elapsed:8.0f} articles/s  peak {peak / 2**20:7.1f} MiB")
+    exact, approx = results.values()
+    print(f"top-50 overlap with exact counts: {len(set(exact) & set(approx)) / 50:.0%}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["merge"]:
+        merge_files(*sys.argv[2:])
+    else:
+        benchmark(*map(int, sys.argv[1:2]))